@@ -6,66 +6,144 @@ ComfyUI翻译文件检查工具
 """
 
 import json
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def check_translation_file(file_path):
-    """检查翻译文件"""
-    print(f"检查翻译文件: {file_path}")
-    
-    # 1. 检查文件是否存在
-    if not os.path.exists(file_path):
-        print("❌ 文件不存在")
-        return False
-    
-    print("✅ 文件存在")
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+def _load_json_mapped(f, file_size):
+    """通过内存映射解析已打开的 JSON 文件，避免先整体读入内存再解析"""
+    if file_size == 0:  # 空文件无法映射，交给解析器报错
+        return orjson.loads(b'') if orjson else json.loads(b'')
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if orjson:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        return json.loads(mm[:])
+
+def check_translation_file(file_path, out=print):
+    """检查翻译文件
     
-    # 2. 检查文件大小
-    file_size = os.path.getsize(file_path)
-    print(f"📁 文件大小: {file_size} 字节")
+    Args:
+        file_path: 翻译文件路径
+        out: 输出函数，默认直接打印；并行检查时用于收集各文件的输出
+    """
+    out(f"检查翻译文件: {file_path}")
     
-    # 3. 检查JSON格式
+    # 1. 打开文件，以 FileNotFoundError 判断是否存在
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print("✅ JSON格式正确")
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON格式错误: {e}")
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        out("❌ 文件不存在")
         return False
-    except Exception as e:
-        print(f"❌ 读取文件失败: {e}")
+    except OSError as e:
+        out(f"❌ 读取文件失败: {e}")
         return False
     
+    with f:
+        out("✅ 文件存在")
+        
+        # 2. 检查文件大小（对已打开的文件 fstat，无需再按路径 stat）
+        file_size = os.fstat(f.fileno()).st_size
+        out(f"📁 文件大小: {file_size} 字节")
+        
+        # 3. 检查JSON格式
+        try:
+            data = _load_json_mapped(f, file_size)
+            out("✅ JSON格式正确")
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError 是其子类
+            out(f"❌ JSON格式错误: {e}")
+            return False
+        except Exception as e:
+            out(f"❌ 读取文件失败: {e}")
+            return False
+    
     # 4. 检查数据结构
     if not isinstance(data, dict):
-        print("❌ 根节点应该是对象")
+        out("❌ 根节点应该是对象")
         return False
     
-    print("✅ 数据结构正确")
+    out("✅ 数据结构正确")
     
     # 5. 统计节点数量
     node_count = len(data)
-    print(f"📊 节点数量: {node_count}")
+    out(f"📊 节点数量: {node_count}")
     
-    # 6. 检查节点结构
+    # 6. 检查节点结构，同一遍遍历中收集前5个节点的预览
+    # JSON 解析结果不会是 dict 的子类，直接比较类型
     valid_nodes = 0
-    for node_name, node_data in data.items():
-        if isinstance(node_data, dict):
-            if 'title' in node_data:
-                valid_nodes += 1
+    preview = []
+    for idx, (node_name, node_data) in enumerate(data.items(), 1):
+        is_dict = type(node_data) is dict
+        if is_dict and 'title' in node_data:
+            valid_nodes += 1
+        if idx <= 5:
+            title = node_data.get('title', '无标题') if is_dict else '格式错误'
+            preview.append(f"  {idx}. {node_name}: {title}")
     
-    print(f"📊 有效节点: {valid_nodes}/{node_count}")
+    out(f"📊 有效节点: {valid_nodes}/{node_count}")
     
     # 7. 显示前几个节点
-    print("\n📋 前5个节点:")
-    for i, (node_name, node_data) in enumerate(data.items()):
-        if i >= 5:
-            break
-        title = node_data.get('title', '无标题') if isinstance(node_data, dict) else '格式错误'
-        print(f"  {i+1}. {node_name}: {title}")
+    out("\n📋 前5个节点:")
+    for line in preview:
+        out(line)
     
     return True
 
+def _check_collect(file_path):
+    """检查单个文件并收集输出，供线程池使用"""
+    lines = []
+    ok = check_translation_file(file_path, out=lines.append)
+    return ok, lines
+
+def _iter_json_files(root):
+    """递归产出目录下的所有 .json 文件路径
+    
+    使用显式栈和 os.scandir，目录项类型取自 DirEntry 缓存，无需逐个 stat。
+    """
+    stack = [root]
+    scandir = os.scandir
+    while stack:
+        with scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.json') and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+def check_all(dir_path):
+    """并行检查目录（含子目录）下的所有翻译 JSON 文件，按路径顺序输出结果
+    
+    Args:
+        dir_path: 翻译文件所在目录（如 zh-CN/Nodes）
+        
+    Returns:
+        list: 每个文件的检查结果
+    """
+    files = sorted(_iter_json_files(dir_path))
+    
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(_check_collect, files))
+    
+    for ok, lines in results:
+        print("\n".join(lines))
+        print("-" * 50)
+    print(f"📊 共检查 {len(results)} 个文件，通过 {sum(ok for ok, _ in results)} 个")
+    return [ok for ok, _ in results]
+
+def _list_subdirs(path):
+    """列出目录下的子目录名，目录不存在或不可读时返回空集合"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it if entry.is_dir()}
+    except OSError:
+        return set()
+
 def check_comfyui_structure(comfyui_path):
     """检查ComfyUI目录结构"""
     print(f"\n检查ComfyUI目录结构: {comfyui_path}")
@@ -78,24 +156,31 @@ def check_comfyui_structure(comfyui_path):
         "custom_nodes/ComfyUI-DD-Translation/zh-CN/Nodes"
     ]
     
+    # 每个父目录只扫描一次，用集合判断子目录是否存在；
+    # 根路径前缀只拼接一次，循环内用字符串相加代替 os.path.join
+    prefix = os.path.join(comfyui_path, "")
+    list_subdirs = _list_subdirs
+    subdirs_cache = {}
     for dir_path in required_dirs:
-        full_path = os.path.join(comfyui_path, dir_path)
-        if os.path.exists(full_path):
+        parent, _, name = dir_path.rpartition("/")
+        if parent not in subdirs_cache:
+            subdirs_cache[parent] = list_subdirs(prefix + parent)
+        if name in subdirs_cache[parent]:
             print(f"✅ {dir_path}")
         else:
             print(f"❌ {dir_path} (不存在)")
     
     # 检查翻译插件是否存在
-    translation_plugin = os.path.join(comfyui_path, "custom_nodes", "ComfyUI-DD-Translation")
-    if os.path.exists(translation_plugin):
+    translation_plugin = prefix + "custom_nodes" + os.sep + "ComfyUI-DD-Translation"
+    if "ComfyUI-DD-Translation" in subdirs_cache.get("custom_nodes", ()):
         print(f"\n📁 翻译插件目录内容:")
         try:
-            for item in os.listdir(translation_plugin):
-                item_path = os.path.join(translation_plugin, item)
-                if os.path.isdir(item_path):
-                    print(f"  📁 {item}/")
-                else:
-                    print(f"  📄 {item}")
+            with os.scandir(translation_plugin) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        print(f"  📁 {entry.name}/")
+                    else:
+                        print(f"  📄 {entry.name}")
         except Exception as e:
             print(f"❌ 无法读取目录: {e}")
 
@@ -123,11 +208,13 @@ def main():
     
     print("\n" + "=" * 50)
     
-    # 检查翻译文件
-    if os.path.exists(default_translation_file):
-        check_translation_file(default_translation_file)
+    # 检查翻译文件（文件不存在时由 check_translation_file 报告）
+    # 命令行传入目录时并行检查其中的所有翻译文件
+    target = sys.argv[1] if len(sys.argv) > 1 else default_translation_file
+    if os.path.isdir(target):
+        check_all(target)
     else:
-        print(f"❌ 翻译文件不存在: {default_translation_file}")
+        check_translation_file(target)
     
     print("\n" + "=" * 50)
     print("检查完成!")
@@ -141,4 +228,7 @@ def main():
     print("5. 检查插件文件夹名称是否与翻译文件名匹配")
 
 if __name__ == "__main__":
+    # 关闭行缓冲，输出积累在缓冲区中批量写出，退出时统一刷新
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
     main()
\ No newline at end of file
@@ -1,64 +1,150 @@
 """修复翻译文件中的类型名"""
 import json
+import mmap
 import os
 import sys
 
+from src.file_utils import FileUtils
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 为可选依赖，未安装时整体加载文件
+    ijson = None
+
+# 类型名到中文的映射
+_TYPE_TO_CHINESE = {
+    'IMAGE': '图像',
+    'MASK': '遮罩',
+    'MODEL': '模型',
+    'LATENT': '潜在空间',
+    'VAE': 'VAE',
+    'CLIP': 'CLIP',
+    'CONDITIONING': '条件',
+    'CONTROL_NET': '控制网络',
+    'COMBO': '选项',
+    'INT': '整数',
+    'FLOAT': '浮点数',
+    'STRING': '字符串',
+    'BOOLEAN': '布尔值'
+}
+_TYPE_KEYS = frozenset(_TYPE_TO_CHINESE)
+# 类型名在 JSON 中以带引号的字符串出现，用于解析前的快速字节搜索
+_TYPE_NEEDLES = tuple(f'"{name}"'.encode('utf-8') for name in _TYPE_TO_CHINESE)
+
+# 大文件读写使用 1MB 缓冲区，减少 read/write 系统调用次数
+_IO_BUFFER_SIZE = 1 << 20
+
+def _iter_nodes(f):
+    """逐个产出顶层节点 (node_name, node_info)
+    
+    安装了 ijson 时流式解析，内存中只保留当前节点；否则整体加载。
+    """
+    if ijson:
+        yield from ijson.kvitems(f, '', use_float=True)
+    else:
+        raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        yield from data.items()
+
+def _dump_entry(node_name, node_info):
+    """将单个节点序列化为顶层对象中的一项，缩进与整体输出保持一致（4 空格）"""
+    key = FileUtils.dumps_json(node_name)
+    body = FileUtils.dumps_json(node_info, indent=4)
+    return b'    ' + key + b': ' + body.replace(b'\n', b'\n    ')
+
+def _fix_node(node_name: str, node_info: dict, fixed_lines: list) -> None:
+    """就地替换单个节点 inputs/widgets/outputs 中的类型名，并记录修复明细"""
+    for section in ('inputs', 'widgets', 'outputs'):
+        sec = node_info.get(section)
+        if sec:
+            for key, value in sec.items():
+                # 绝大多数值不需要替换，先用 frozenset 判断再取映射
+                if value in _TYPE_KEYS:
+                    new_value = _TYPE_TO_CHINESE[value]
+                    sec[key] = new_value
+                    fixed_lines.append(f"✓ {node_name}.{section}.{key}: {value} → {new_value}")
+
+def _may_need_fix(file_path):
+    """解析前在原始字节中搜索类型名，全部找不到时说明文件无需修复
+    
+    只会误判为"可能需要"（例如键名恰好相同），不会漏判。
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:  # 空文件无法映射，交给解析流程报错
+                return True
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return any(mm.find(needle) != -1 for needle in _TYPE_NEEDLES)
+    except OSError:  # 由后续流程报告具体错误
+        return True
+
+def _discard(path):
+    """删除临时文件，文件不存在或无法删除时忽略"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 def fix_translation_file(file_path):
     """修复翻译文件中的类型名
     
     Args:
         file_path: 翻译文件路径
     """
-    # 类型名到中文的映射
-    type_to_chinese = {
-        'IMAGE': '图像',
-        'MASK': '遮罩',
-        'MODEL': '模型',
-        'LATENT': '潜在空间',
-        'VAE': 'VAE',
-        'CLIP': 'CLIP',
-        'CONDITIONING': '条件',
-        'CONTROL_NET': '控制网络',
-        'COMBO': '选项',
-        'INT': '整数',
-        'FLOAT': '浮点数',
-        'STRING': '字符串',
-        'BOOLEAN': '布尔值'
-    }
-    
     print(f"\n处理文件: {file_path}")
     print("=" * 80)
     
+    # 已修复过的文件直接跳过，省去整个解析和重写过程
+    if not _may_need_fix(file_path):
+        print("无需修复")
+        return False
+    
+    # 边读边写到同目录的临时文件，完成后再替换原文件
+    tmp_path = file_path + '.tmp'
+    fixed_lines = []  # 修复明细，循环结束后统一输出
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb', buffering=_IO_BUFFER_SIZE) as src, \
+                open(tmp_path, 'wb', buffering=_IO_BUFFER_SIZE) as dst:
+            dst.write(b'{')
+            sep = b'\n'
+            for node_name, node_info in _iter_nodes(src):
+                _fix_node(node_name, node_info, fixed_lines)
+                dst.write(sep + _dump_entry(node_name, node_info))
+                sep = b',\n'
+            dst.write(b'}' if sep == b'\n' else b'\n}')
+            if fixed_lines:
+                # 替换前落盘，确保崩溃时原文件或新文件总有一个是完整的
+                dst.flush()
+                os.fsync(dst.fileno())
+    except FileNotFoundError:
+        print(f"错误: 文件不存在: {file_path}")
+        return False
     except Exception as e:
-        print(f"错误: 无法读取文件: {str(e)}")
+        _discard(tmp_path)
+        print(f"错误: 无法处理文件: {str(e)}")
         return False
     
-    fixed_count = 0
-    for node_name, node_info in data.items():
-        for section in ['inputs', 'widgets', 'outputs']:
-            if section in node_info:
-                for key, value in node_info[section].items():
-                    if value in type_to_chinese:
-                        old_value = value
-                        new_value = type_to_chinese[value]
-                        node_info[section][key] = new_value
-                        fixed_count += 1
-                        print(f"✓ {node_name}.{section}.{key}: {old_value} → {new_value}")
+    fixed_count = len(fixed_lines)
+    if fixed_lines:
+        print("\n".join(fixed_lines))
     
     if fixed_count > 0:
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
             print(f"\n成功修复 {fixed_count} 个参数")
             print(f"文件已保存: {file_path}")
             return True
-        except Exception as e:
+        except OSError as e:
+            _discard(tmp_path)
             print(f"错误: 无法保存文件: {str(e)}")
             return False
     else:
+        _discard(tmp_path)
         print("无需修复")
         return False
 
@@ -92,4 +178,7 @@ def main():
     print("=" * 80)
 
 if __name__ == "__main__":
+    # 关闭行缓冲，输出积累在缓冲区中批量写出，退出时统一刷新
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
     main()
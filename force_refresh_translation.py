@@ -5,9 +5,38 @@
 """
 
 import os
+import sys
 import shutil
 import json
 import time
+from pathlib import Path
+
+from src.file_utils import FileUtils
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+def _replace_with_copy(path):
+    """写出文件副本并 fsync，再用 os.replace 原子替换原文件
+    
+    替换后文件具有新的文件标识（inode/FileID）和修改时间，
+    依赖文件标识或时间戳缓存的程序会重新打开它，全程无需等待。
+    """
+    tmp_path = path + ".new"
+    try:
+        with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 def force_refresh_translation():
     """强制刷新翻译"""
@@ -15,7 +44,7 @@ def force_refresh_translation():
     
     print("🔄 强制刷新ComfyUI翻译...")
     
-    # 1. 检查并备份原翻译文件
+    # 1. 检查翻译文件并替换为新副本
     translation_file = os.path.join(
         comfyui_path,
         "custom_nodes",
@@ -25,81 +54,66 @@ def force_refresh_translation():
         "ComfyUI-MieNodes.json"
     )
     
-    if os.path.exists(translation_file):
-        print(f"✅ 找到翻译文件: {translation_file}")
-        
-        # 创建备份
-        backup_file = translation_file + ".backup"
-        shutil.copy2(translation_file, backup_file)
-        print(f"📁 已创建备份: {backup_file}")
-        
-        # 临时删除翻译文件
-        os.remove(translation_file)
-        print("🗑️ 临时删除翻译文件")
-        
-        # 等待2秒
-        time.sleep(2)
-        
-        # 恢复翻译文件
-        shutil.copy2(backup_file, translation_file)
-        print("📁 恢复翻译文件")
-        
-        # 删除备份
-        os.remove(backup_file)
-        print("🗑️ 删除备份文件")
-        
-    else:
+    # 以 FileNotFoundError 判断文件是否存在，省去单独的 exists 检查
+    try:
+        _replace_with_copy(translation_file)
+    except FileNotFoundError:
         print(f"❌ 翻译文件不存在: {translation_file}")
         return
     
+    print(f"✅ 找到翻译文件: {translation_file}")
+    print("🔁 已原子替换翻译文件（新的文件标识与修改时间）")
+    
     # 2. 检查并清理可能的缓存文件
-    cache_dirs = [
-        os.path.join(comfyui_path, "custom_nodes", "ComfyUI-DD-Translation", "__pycache__"),
-        os.path.join(comfyui_path, "__pycache__"),
-        os.path.join(comfyui_path, "web", "cache")  # 如果存在
-    ]
+    # 按父目录分组，每个父目录只列举一次，不存在的缓存目录无需逐个 stat
+    cache_dirs = {
+        os.path.join(comfyui_path, "custom_nodes", "ComfyUI-DD-Translation"): ["__pycache__"],
+        comfyui_path: ["__pycache__"],
+        os.path.join(comfyui_path, "web"): ["cache"]  # 如果存在
+    }
     
-    for cache_dir in cache_dirs:
-        if os.path.exists(cache_dir):
+    for parent, names in cache_dirs.items():
+        try:
+            with os.scandir(parent) as it:
+                present = {entry.name for entry in it if entry.is_dir(follow_symlinks=False)}
+        except FileNotFoundError:
+            continue
+        for name in names:
+            if name not in present:
+                continue
+            cache_dir = os.path.join(parent, name)
             try:
                 shutil.rmtree(cache_dir)
                 print(f"🗑️ 清理缓存目录: {cache_dir}")
             except Exception as e:
                 print(f"⚠️ 无法清理缓存目录 {cache_dir}: {e}")
     
-    # 3. 修改翻译文件的时间戳
-    if os.path.exists(translation_file):
-        # 更新文件的修改时间为当前时间
-        current_time = time.time()
-        os.utime(translation_file, (current_time, current_time))
-        print("⏰ 更新翻译文件时间戳")
-    
-    # 4. 检查ComfyUI-DD-Translation配置
-    config_file = os.path.join(
+    # 3. 检查ComfyUI-DD-Translation配置
+    config_file = Path(
         comfyui_path,
         "custom_nodes",
         "ComfyUI-DD-Translation",
         "config.json"
     )
     
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            # 确保翻译功能启用
-            config["translation_enabled"] = True
-            
-            # 添加强制刷新标记
-            config["force_refresh"] = int(time.time())
-            
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-            
-            print("✅ 更新翻译插件配置")
-            
-        except Exception as e:
-            print(f"⚠️ 无法更新配置文件: {e}")
+    try:
+        raw = config_file.read_bytes()
+        config = orjson.loads(raw) if orjson else json.loads(raw)
+        
+        # 确保翻译功能启用
+        config["translation_enabled"] = True
+        
+        # 添加强制刷新标记
+        config["force_refresh"] = int(time.time())
+        
+        config_file.write_bytes(FileUtils.dumps_json(config, indent=2))
+        
+        print("✅ 更新翻译插件配置")
+        
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ 无法更新配置文件: {e}")
     
     print("\n🎉 刷新完成!")
     print("\n📋 接下来的步骤:")
@@ -110,4 +124,7 @@ def force_refresh_translation():
     print("5. 如果仍然不生效，尝试重新安装ComfyUI-DD-Translation插件")
 
 if __name__ == "__main__":
+    # 关闭行缓冲，输出积累在缓冲区中批量写出，退出时统一刷新
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
     force_refresh_translation()
\ No newline at end of file
@@ -30,29 +30,224 @@ from tkinter import ttk, filedialog, scrolledtext, messagebox
 from tkinterdnd2 import *
 import threading
 import json
+import copy
+import re
 import time
 import logging
 import shutil
 import webbrowser
 import subprocess
+import importlib
+import functools
+from types import MappingProxyType
+from collections import deque, Counter
+from operator import itemgetter
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
 from src.node_parser import NodeParser
 from src.translator import Translator
 from src.file_utils import FileUtils
-from src.translation_config import TranslationServices
-from src.diff_tab import DiffTab
-from src.ollama_translator import OllamaTranslator
-from src.lmstudio_translator import LMStudioTranslator
-from src.siliconflow_translator import SiliconFlowTranslator
+from src.translation_config import TranslationServices, TranslationConfig
+
+CONFIG_PATH = 'config.json'
+CONFIG_IO_BUFFER_SIZE = 1 << 20  # 配置文件读写缓冲区大小
+
+# 只读空字典：作为 dict.get 的默认值，避免每次查找都新建 {}
+_EMPTY = MappingProxyType({})
+
+# 各服务专用的翻译器模块在首次使用时才导入，缩短启动时间
+_TRANSLATOR_MODULES = {
+    "ollama": ("src.ollama_translator", "OllamaTranslator"),
+    "lmstudio": ("src.lmstudio_translator", "LMStudioTranslator"),
+    "siliconflow": ("src.siliconflow_translator", "SiliconFlowTranslator"),
+}
+
+# 日志严重程度分类：按优先级排列的前瞻分支，第一个命中的分支即为结果，
+# 一次 search 即可得到分类（lastindex 对应 _SEVERITY_CLASSES 的键）
+_SEVERITY_RE = re.compile(
+    r'^(?:'
+    r'(?=.*?(?:错误|失败|异常|Error|Failed))()'
+    r'|(?=.*?(?:警告|注意|Warning|策略|限流))()'
+    r'|(?=.*?(?:成功|完成|已保存|Success|Done))()'
+    r'|(?=.*?(?:\[准备\]|\[翻译\]|\[验证\]|\[统计\]|\[二次筛查\]))()'
+    r')',
+    re.S
+)
+_SEVERITY_CLASSES = {
+    0: ("info", '📌'),
+    1: ("error", '🚨'),
+    2: ("warning", '⚠️'),
+    3: ("success", '✅'),
+    4: ("step", '🔄'),
+}
+# 任务结束汇总行中的失败数
+_SUMMARY_FAILED_RE = re.compile(r'失败:\s*(\d+)')
+# ComfyUITranslator.log 的关键词分类（英文不区分大小写），用法同 _SEVERITY_RE：
+# lastindex 1=错误 2=警告 3=成功，未命中为普通信息；_LOG_KINDS 给出对应的图标和日志级别
+_LOG_KIND_RE = re.compile(
+    r'^(?:'
+    r'(?=.*?(?:错误|失败|异常|error|failed))()'
+    r'|(?=.*?(?:警告|注意|warn))()'
+    r'|(?=.*?(?:成功|完成|已保存|已生成|success|done))()'
+    r')',
+    re.S | re.I
+)
+_LOG_KINDS = {
+    0: ('📌', logging.INFO),
+    1: ('🚨', logging.ERROR),
+    2: ('⚠️', logging.WARNING),
+    3: ('😊', logging.INFO),
+}
+
+# _parse_error_info 使用的接口错误信息字段
+_ERR_CODE_RE = re.compile(r'Error code:\s*(\d+)')
+_ERR_PROVIDER_RE = re.compile(r"provider_name['\"]?:\s*['\"]([^'\"]+)['\"]")
+_ERR_RAW_RE = re.compile(r"raw['\"]?:\s*['\"](.*?)['\"]")
+
+# 本地化错误信息中用于日志输出的字段
+_LOCALIZED_FIELDS = itemgetter("code", "title", "reason", "solution", "params")
+
+@functools.lru_cache(maxsize=256)
+def _localize_error(code, provider, raw):
+    """TranslationConfig.localize_error 的缓存版本：批量任务中同一错误反复出现时直接复用结果
+
+    返回的字典被多个失败记录共享，调用方不应修改
+    """
+    return TranslationConfig.localize_error(code, provider, raw)
+
+# 失败报告中统计的重试策略事件类型
+_STRATEGY_EVENT_TYPES = ("rate_limit_retry", "switch_single_user", "split_batch")
+
+# 翻译进度消息中需要显示到日志的标签；前两个同时更新策略状态栏（按此顺序匹配）
+_PROGRESS_LOG_TAGS = ("[限流]", "[策略]", "[翻译]", "[验证]", "[完成]", "[统计]")
+_PROGRESS_STATUS_TAGS = frozenset(_PROGRESS_LOG_TAGS[:2])
+
+# 控制台“显示级别”选项
+_CONSOLE_LEVELS = {
+    "全部": logging.DEBUG,
+    "信息": logging.INFO,
+    "警告": logging.WARNING,
+    "错误": logging.ERROR,
+}
+
+def _parse_one(folder, parallel=False):
+    """解析单个插件目录，返回 (目录, 目录修改时间, 节点信息)
+
+    定义在模块顶层，供检测阶段的进程池调用；parallel 为 True 时插件内的文件用进程池并行解析，
+    仅在检测阶段（同一时间只有一个检测任务）开启
+    """
+    try:
+        mtime = os.path.getmtime(folder)
+    except OSError:
+        mtime = None
+    parser = NodeParser(folder)
+    return folder, mtime, parser.optimize_node_info(parser.parse_folder(folder, parallel=parallel))
+
+class FormatPrepFilter(logging.Filter):
+    """日志预处理过滤器：在产生日志的线程中完成格式化与分类，
+    结果挂在 record 上，TextHandler 只负责把它交给 UI 线程"""
+    _ERROR = logging.ERROR
+    _WARNING = logging.WARNING
+
+    def __init__(self, formatter=None):
+        super().__init__()
+        self._formatter = formatter or logging.Formatter('%(message)s')
+        # 时间戳按秒缓存；存为元组，多线程读写时不会读到不一致的一对值
+        self._ts_cache = (0, '')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_prefix(timestamp, icon):
+        """时间戳+图标前缀"""
+        return ''.join(('[', timestamp, '] ', icon, ' '))
+
+    def filter(self, record):
+        msg = self._formatter.format(record)
+        try:
+            now = int(time.time())
+            ts_sec, timestamp = self._ts_cache
+            if now != ts_sec:
+                timestamp = time.strftime('%H:%M:%S', time.localtime(now))
+                self._ts_cache = (now, timestamp)
+            
+            # Determine icon and base tags: 先比较日志级别，再做一次正则分类
+            if record.levelno >= self._ERROR:
+                severity = 1
+            else:
+                m = _SEVERITY_RE.search(msg)
+                severity = m.lastindex if m else 0
+                if record.levelno >= self._WARNING and severity != 1:
+                    severity = 2
+            tag, icon = _SEVERITY_CLASSES[severity]
+            
+            # Treeview 只能整行着色：列出节点名的翻译批次行用节点色（错误和警告除外），
+            # 任务结束汇总行加高亮背景，有失败时整行用错误色
+            if '翻译任务结束' in msg:
+                failed = _SUMMARY_FAILED_RE.search(msg)
+                tags = ("error" if failed and int(failed.group(1)) else "success", "summary")
+            elif severity not in (1, 2) and '[翻译]' in msg and ':' in msg:
+                tags = ("node",)
+            else:
+                tags = (tag,)
+            
+            # 控制台按行着色，前缀在同一秒内复用同一个字符串
+            line = self._build_prefix(timestamp, icon) + msg
+            
+            record._timestamp = timestamp
+            record._icon = icon
+            record._tags = tags
+            record._line = line
+            record._msg = msg
+            
+        except Exception:
+            record._tags = ("info",)
+            record._line = msg
+            record._msg = msg
+        return True
 
 class TextHandler(logging.Handler):
-    """自定义日志处理器，支持富文本、智能滚动和性能优化"""
-    def __init__(self, text_widget):
+    """自定义日志处理器，支持按级别着色、智能滚动和性能优化
+
+    日志显示在单列 ttk.Treeview 中：每条日志一行，按严重程度打行标签
+    （节点批次行和任务结束汇总行另有专用标签），
+    Treeview 只绘制可见行，日志再多滚动和追加的开销也只与可见区域有关"""
+    POLL_INTERVAL_MS = 50    # UI 线程轮询日志队列的间隔
+    POLL_BATCH = 256         # 每次轮询最多取出的消息数
+    TRIM_HIGH_WATER = 6000   # 超过该行数时触发裁剪
+    TRIM_KEEP_LINES = 5000   # 裁剪后保留的行数
+    MAX_PENDING = 4096       # 待显示消息上限，超出时丢弃最旧的
+
+    def __init__(self, view, vbar=None):
         super().__init__()
-        self.text_widget = text_widget
-        self._pending_messages = []
-        self._update_scheduled = False
+        self.view = view
+        self.vbar = vbar
+        self._rows = deque()  # 按插入顺序记录行 id，裁剪时从左侧弹出
+        # 低于该级别的日志不显示（只影响控制台，不影响其他处理器）
+        self.min_display_level = logging.INFO
+        # 控件是否可见，由 Map/Unmap 事件维护，避免在日志线程中调用 Tk
+        self._viewable = False
+        # 工作线程只往环形队列里放消息，由 UI 线程的轮询器取出刷新，
+        # 避免在非 UI 线程上调用 Tk；deque 的 append/popleft 是线程安全的，
+        # 日志洪峰时自动丢弃最旧的消息，内存有上限
+        self._pending_messages = deque(maxlen=self.MAX_PENDING)
+        # 控制台不可见时取出的消息先暂存在这里，不做任何 Tk 调用，重新可见时一次性刷新；
+        # 上限与裁剪后保留的行数一致，超出部分本来也会被裁剪掉
+        self._hidden_backlog = deque(maxlen=self.TRIM_KEEP_LINES)
+        self._trim_scheduled = False
+        self._sync_pending = False
+        # 连续重复消息合并为一行并显示 (xN)
+        self.coalesce_enabled = True
+        self._last_msg = None
+        self._last_iid = None
+        self._last_line = ''
+        self._last_count = 0
         self.auto_scroll = True
         self.last_yview = (0.0, 1.0)
         
@@ -61,25 +256,25 @@ class TextHandler(logging.Handler):
         
         # 绑定滚动事件
         self._bind_events()
+        
+        # 只取消息正文，时间戳和图标由过滤器添加；
+        # 格式化与分类在调用线程中由过滤器完成
+        self.setFormatter(logging.Formatter('%(message)s'))
+        self.addFilter(FormatPrepFilter(self.formatter))
+        
+        # 启动日志队列轮询（在 UI 线程中创建处理器时调用）
+        self.view.after(self.POLL_INTERVAL_MS, self._poll_queue)
 
     def _configure_tags(self):
-        """配置文本标签颜色"""
+        """配置行标签颜色"""
         try:
-            # 确保 text_widget 是实际的 Text 控件
-            # ScrolledText 是 Frame，需要获取内部 Text
-            if isinstance(self.text_widget, scrolledtext.ScrolledText):
-                self.text_impl = self.text_widget.frame.children.get('!text', self.text_widget)
-            else:
-                self.text_impl = self.text_widget
-
-            self.text_widget.tag_config("timestamp", foreground="#555555")
-            self.text_widget.tag_config("error", foreground="#8b0000") # 墨红色
-            self.text_widget.tag_config("warning", foreground="#ffaa00") # 橙色
-            self.text_widget.tag_config("success", foreground="#006400") # 墨绿色
-            self.text_widget.tag_config("info", foreground="#000000") # 黑色
-            self.text_widget.tag_config("step", foreground="#0066cc") # 蓝色
-            self.text_widget.tag_config("node", foreground="#9933cc") # 紫色
-            self.text_widget.tag_config("highlight", background="#eeeeee") # 高亮背景
+            self.view.tag_configure("error", foreground="#8b0000") # 墨红色
+            self.view.tag_configure("warning", foreground="#ffaa00") # 橙色
+            self.view.tag_configure("success", foreground="#006400") # 墨绿色
+            self.view.tag_configure("info", foreground="#000000") # 黑色
+            self.view.tag_configure("step", foreground="#0066cc") # 蓝色
+            self.view.tag_configure("node", foreground="#9933cc") # 紫色，列出节点名的翻译批次行
+            self.view.tag_configure("summary", background="#eeeeee") # 高亮背景，任务结束汇总行
         except Exception:
             pass
 
@@ -87,19 +282,54 @@ class TextHandler(logging.Handler):
         """绑定滚动相关事件"""
         try:
             # 绑定鼠标滚轮
-            self.text_widget.bind('<MouseWheel>', self._on_scroll)
-            self.text_widget.bind('<Button-4>', self._on_scroll) # Linux
-            self.text_widget.bind('<Button-5>', self._on_scroll) # Linux
+            self.view.bind('<MouseWheel>', self._on_scroll)
+            self.view.bind('<Button-4>', self._on_scroll) # Linux
+            self.view.bind('<Button-5>', self._on_scroll) # Linux
             
             # 绑定拖动
-            self.text_widget.bind('<B1-Motion>', self._on_drag)
+            self.view.bind('<B1-Motion>', self._on_drag)
             
-            # 绑定滚动条操作 (如果能获取到滚动条)
-            if hasattr(self.text_widget, 'vbar'):
-                self.text_widget.vbar.bind('<ButtonRelease-1>', self._check_scroll_position)
-                self.text_widget.vbar.bind('<B1-Motion>', self._check_scroll_position)
+            # 复制选中的日志行
+            self.view.bind('<Control-c>', self._copy_selection)
+            
+            # 跟踪可见性：标签页切换时映射/取消映射的是所在的父容器
+            for widget in (self.view, self.view.master):
+                widget.bind('<Map>', self._update_viewable, add='+')
+                widget.bind('<Unmap>', self._update_viewable, add='+')
+            
+            # 绑定滚动条操作
+            if self.vbar is not None:
+                self.vbar.bind('<ButtonRelease-1>', self._check_scroll_position)
+                self.vbar.bind('<B1-Motion>', self._check_scroll_position)
+        except Exception:
+            pass
+
+    def _update_viewable(self, event=None):
+        """刷新缓存的可见状态"""
+        try:
+            self._viewable = bool(self.view.winfo_viewable())
+        except tk.TclError:
+            self._viewable = False
+        if not self._viewable:
+            return
+        # 切回控制台时补上隐藏期间暂存的日志，并补做跳过的滚动
+        if self._hidden_backlog:
+            backlog = list(self._hidden_backlog)
+            self._hidden_backlog.clear()
+            self._flush_messages(backlog)
+        elif self._sync_pending:
+            self._sync_view()
+
+    def _copy_selection(self, event=None):
+        """把选中的日志行复制到剪贴板"""
+        try:
+            lines = [self.view.item(iid, 'text') for iid in self.view.selection()]
+            if lines:
+                self.view.clipboard_clear()
+                self.view.clipboard_append('\n'.join(lines))
         except Exception:
             pass
+        return "break"
 
     def _on_scroll(self, event):
         """处理鼠标滚轮事件"""
@@ -121,7 +351,7 @@ class TextHandler(logging.Handler):
         """检查当前滚动位置，决定是否恢复自动滚动"""
         try:
             # yview 返回 (top, bottom) 比例，1.0 表示在底部
-            pos = self.text_widget.yview()
+            pos = self.view.yview()
             # 如果底部接近 1.0 (允许微小误差)，则恢复自动滚动
             if pos[1] >= 0.99:
                 self.auto_scroll = True
@@ -130,166 +360,260 @@ class TextHandler(logging.Handler):
         except:
             pass
 
-    def _emit_deprecated(self, record):
-        msg = self.format(record)
-        try:
-            import logging as _logging
-            tags = []
-            
-            # 时间戳
-            timestamp = time.strftime('%H:%M:%S')
-            
-            # 解析消息内容确定标签
-            lower_msg = msg.lower()
-            
-            # 错误
-            if record.levelno >= _logging.ERROR or any(k in msg for k in ['错误', '失败', '异常', 'Error', 'Failed']):
-                tags.append("error")
-                icon = '🚨'
-            # 警告
-            elif record.levelno >= _logging.WARNING or any(k in msg for k in ['警告', '注意', 'Warning', '策略', '限流']):
-                tags.append("warning")
-                icon = '⚠️'
-            # 成功
-            elif any(k in msg for k in ['成功', '完成', '已保存', 'Success', 'Done']):
-                tags.append("success")
-                icon = '✅'
-            # 步骤/阶段
-            elif any(k in msg for k in ['[准备]', '[翻译]', '[验证]', '[统计]', '[二次筛查]']):
-                tags.append("step")
-                icon = ' '
-            else:
-                tags.append("info")
-                icon = ' '
+    def _poll_queue(self):
+        """在 UI 线程中取出队列中的日志消息并刷新，然后重新调度自身
 
-            # 提取节点名称 (假设格式中有节点名)
-            # 这里可以做更复杂的正则匹配
+        刷新出错（如 TclError 或异常记录）时异常照常交给 Tk 报告，
+        但轮询仍会重新调度，不会因为一条记录而永久停止"""
+        batch = []
+        delay = self.POLL_INTERVAL_MS
+        try:
+            popleft = self._pending_messages.popleft
+            try:
+                for _ in range(self.POLL_BATCH):
+                    batch.append(popleft())
+            except IndexError:
+                pass
             
-            formatted_msg = f"[{timestamp}] {icon} {msg}"
-            self._pending_messages.append((formatted_msg, tags))
+            # 本轮取满说明仍有积压，尽快继续处理
+            if len(batch) == self.POLL_BATCH:
+                delay = 1
             
-        except Exception:
-            self._pending_messages.append((msg, ["info"]))
-        
-        # 批量更新UI
-        if not self._update_scheduled:
-            self._update_scheduled = True
-            self.text_widget.after(50, self._flush_messages) # 提高刷新频率到 50ms
+            if batch:
+                if self._viewable:
+                    self._flush_messages(batch)
+                else:
+                    self._hidden_backlog.extend(batch)
+        finally:
+            try:
+                if self.view.winfo_exists():
+                    self.view.after(delay, self._poll_queue)
+            except tk.TclError:
+                pass  # 控件已销毁，停止轮询
     
-    def _flush_messages(self):
+    def _flush_messages(self, pending):
         """批量刷新消息到UI"""
-        if self._pending_messages:
-            self.text_widget.config(state='normal')
-            
-            # 锁定更新以减少闪烁
-            for segments in self._pending_messages:
-                for text, tags in segments:
-                    self.text_widget.insert(tk.END, text, tuple(tags))
-                self.text_widget.insert(tk.END, '\n')
-            
-            # 缓冲区清理
-            content_end = self.text_widget.index(tk.END)
-            line_count = int(content_end.split('.')[0])
-            if line_count > 5000: # 限制最大行数
-                self.text_widget.delete('1.0', f'{line_count - 4000}.0')
-            
-            if self.auto_scroll:
-                self.text_widget.see(tk.END)
+        if pending:
+            view = self.view
+            insert = view.insert
+            rows = self._rows
+            coalesce = self.coalesce_enabled
+            for text, tags, msg in pending:
+                # 与上一条内容相同则不新增行，只在上一行末尾更新重复次数
+                if coalesce and msg == self._last_msg and self._last_iid is not None:
+                    self._last_count += 1
+                    view.item(self._last_iid, text=f"{self._last_line} (x{self._last_count})")
+                    continue
                 
-            self.text_widget.config(state='disabled')
-            self._pending_messages.clear()
-        self._update_scheduled = False
-
-    def emit(self, record):
-        msg = self.format(record)
-        try:
-            import logging as _logging
+                # 多行消息（如异常堆栈）拆成多行显示
+                for line in text.split('\n'):
+                    iid = insert('', 'end', text=line, tags=tags)
+                    rows.append(iid)
+                self._last_msg = msg
+                self._last_iid = iid
+                self._last_line = line
+                self._last_count = 1
             
-            timestamp = time.strftime('%H:%M:%S')
-            base_tags = []
-            icon = '📌'
+            # 缓冲区清理：超过上限才在空闲时一次性裁剪（隐藏时也照常裁剪，保证内存有上限）
+            if len(rows) > self.TRIM_HIGH_WATER and not self._trim_scheduled:
+                self._trim_scheduled = True
+                view.after_idle(self._trim_buffer)
             
-            # Determine icon and base tags
-            if record.levelno >= _logging.ERROR or any(k in msg for k in ['错误', '失败', '异常', 'Error', 'Failed']):
-                base_tags.append("error")
-                icon = '🚨'
-            elif record.levelno >= _logging.WARNING or any(k in msg for k in ['警告', '注意', 'Warning', '策略', '限流']):
-                base_tags.append("warning")
-                icon = '⚠️'
-            elif any(k in msg for k in ['成功', '完成', '已保存', 'Success', 'Done']):
-                base_tags.append("success")
-                icon = '✅'
-            elif any(k in msg for k in ['[准备]', '[翻译]', '[验证]', '[统计]', '[二次筛查]']):
-                base_tags.append("step")
-                icon = '🔄'
+            # 控制台不可见时只插入行，滚动推迟到重新可见时再做
+            if self._viewable:
+                self._sync_view()
             else:
-                base_tags.append("info")
-                
-            formatted_segments = []
-            # 添加时间戳和图标
-            formatted_segments.append((f"[{timestamp}] {icon} ", ["timestamp"]))
-            
-            # 特殊解析：高亮翻译步骤中的节点名称
-            # 假设格式: [翻译] 第 x/y 批: NodeA, NodeB
-            if '[翻译]' in msg and ':' in msg:
-                try:
-                    prefix, nodes_str = msg.split(':', 1)
-                    formatted_segments.append((prefix + ": ", base_tags))
-                    
-                    # 分割并高亮节点名
-                    nodes = nodes_str.split(',')
-                    for i, node in enumerate(nodes):
-                        # 去除空白
-                        node_clean = node.strip()
-                        # 添加前导空格(如果原字符串有)
-                        pre_space = " " if node.startswith(" ") else ""
-                        formatted_segments.append((pre_space + node_clean, ["node"]))
-                        if i < len(nodes) - 1:
-                            formatted_segments.append((",", base_tags))
-                except:
-                    formatted_segments.append((msg, base_tags))
-            elif "翻译任务结束" in msg:
-                try:
-                    # 格式: "翻译任务结束。成功: X" 或 "翻译任务结束。成功: X, 失败: Y"
-                    import re
-                    # 先添加前缀
-                    formatted_segments.append(("翻译任务结束。", ["info"]))
-                    
-                    # 提取成功
-                    s = re.search(r'(成功:\s*\d+)', msg)
-                    if s:
-                        formatted_segments.append((" " + s.group(1), ["success"]))
-                        
-                    # 提取失败
-                    f = re.search(r'(失败:\s*\d+)', msg)
-                    if f:
-                        if s: formatted_segments.append((",", ["info"]))
-                        formatted_segments.append((" " + f.group(1), ["error"]))
-                        
-                    # 如果匹配失败（预防万一），回退到默认
-                    if not s and not f:
-                        formatted_segments.pop() # remove prefix
-                        formatted_segments.append((msg, base_tags))
-                except:
-                    formatted_segments.append((msg, base_tags))
+                self._sync_pending = True
+
+    def _sync_view(self):
+        """滚动到最新一行"""
+        self._sync_pending = False
+        if self.auto_scroll and self._last_iid is not None:
+            self.view.see(self._last_iid)
+
+    def _trim_buffer(self):
+        """删除最旧的日志行，只保留 TRIM_KEEP_LINES 行"""
+        self._trim_scheduled = False
+        rows = self._rows
+        excess = len(rows) - self.TRIM_KEEP_LINES
+        if excess > 0:
+            self.view.delete(*[rows.popleft() for _ in range(excess)])
+
+    def filter(self, record):
+        # 在格式化之前丢弃低于显示级别的记录；控制台不可见时记录照常保留，
+        # 只是推迟到重新可见时再显示
+        if record.levelno < self.min_display_level:
+            return False
+        return super().filter(record)
+
+    def emit(self, record):
+        # 整行文本与行颜色已由 FormatPrepFilter 在产生日志的线程中准备好
+        line = getattr(record, '_line', None)
+        if line is None:
+            msg = self.format(record)
+            self._pending_messages.append((msg, ("info",), msg))
+        else:
+            self._pending_messages.append((line, record._tags, record._msg))
+
+class TokenBucket:
+    """令牌桶限流器：按 rate_per_sec 匀速补充令牌，最多积累 burst 个以允许突发
+
+    遇到 429 时速率减半，连续 RECOVER_AFTER 次成功后速率加倍（不超过初始速率）。
+    rate_per_sec 为 None 时不限速，直到第一次 429 才开始限速，
+    初始速率取此前实测请求速率的一半
+    """
+    RECOVER_AFTER = 10
+    MIN_RATE_DIVISOR = 16  # 速率最多降到初始值的 1/16
+
+    def __init__(self, rate_per_sec, burst):
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = self._started = time.monotonic()
+        self._acquired = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+        self.rate = None
+        if rate_per_sec is not None:
+            self._set_max_rate(float(rate_per_sec))
+
+    def _set_max_rate(self, rate):
+        self.max_rate = self.rate = rate
+        self.min_rate = self.max_rate / self.MIN_RATE_DIVISOR
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """取一个令牌，没有可用令牌时阻塞到下一个令牌补充完成"""
+        with self._cond:
+            self._acquired += 1
+            if self.rate is None:
+                return
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        with self._cond:
+            if self.rate is None:
+                return
+            self._successes += 1
+            if self._successes >= self.RECOVER_AFTER:
+                self._successes = 0
+                if self.rate < self.max_rate:
+                    self._refill()
+                    self.rate = min(self.max_rate, self.rate * 2)
+
+    def on_rate_limited(self):
+        with self._cond:
+            self._successes = 0
+            if self.rate is None:
+                # 首次限流：以实测请求速率为上限，从其一半开始限速
+                elapsed = max(1.0, time.monotonic() - self._started)
+                self._set_max_rate(self._acquired / elapsed)
+                self._tokens = 0.0
+                self._last = time.monotonic()
             else:
-                formatted_segments.append((msg, base_tags))
-                
-            self._pending_messages.append(formatted_segments)
-            
-        except Exception:
-            self._pending_messages.append([(msg, ["info"])])
-        
-        # 批量更新UI
-        if not self._update_scheduled:
-            self._update_scheduled = True
-            self.text_widget.after(50, self._flush_messages) # 提高刷新频率到 50ms
+                self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+
+class BatchQueue:
+    """跨插件合并翻译请求
+
+    节点数不足一批的小插件先排队，凑满一批（或达到字符上限）后合并为一次 LLM 请求。
+    合并时节点键加上 "序号%%" 前缀区分来源插件，返回后按前缀拆回各插件，
+    交给 on_done(plugin_id, translated) 处理；单独成组的插件不合并，按原流程翻译。
+    内容完全相同的节点（常见于复制或 fork 的节点包）只发送一次，译文复用到各插件。
+    """
+    SEPARATOR = "%%"
+    MAX_CHARS = 60 * 1024  # 单次合并请求的字符上限
+
+    def __init__(self, translator, max_nodes, on_done, update_progress=None):
+        self.translator = translator
+        self.max_nodes = max(1, int(max_nodes))
+        self.on_done = on_done
+        self.update_progress = update_progress
+        self._items = []  # (plugin_id, nodes)
+        self._node_count = 0
+        self._char_count = 0
+
+    def enqueue(self, plugin_id, nodes):
+        size = len(json.dumps(nodes, ensure_ascii=False))
+        if self._items and (self._node_count + len(nodes) > self.max_nodes
+                            or self._char_count + size > self.MAX_CHARS):
+            self.flush()
+        self._items.append((plugin_id, nodes))
+        self._node_count += len(nodes)
+        self._char_count += size
+        if self._node_count >= self.max_nodes:
+            self.flush()
+
+    def flush(self):
+        items = self._items
+        self._items = []
+        self._node_count = self._char_count = 0
+        if len(items) < 2:
+            return
+        sep = self.SEPARATOR
+        merged = {}
+        first_key = {}    # 节点内容签名 -> 首次出现的合并键
+        duplicates = {}   # 重复节点的合并键 -> (首次出现的合并键, 原始节点)
+        for idx, (_, nodes) in enumerate(items):
+            for node_name, node_data in nodes.items():
+                key = f"{idx}{sep}{node_name}"
+                node = {
+                    "_class_name": node_data.get("_class_name", ""),
+                    "_mapped_name": node_data.get("_mapped_name", ""),
+                    "title": node_data.get("title", ""),
+                    "inputs": node_data.get("inputs", {}),
+                    "widgets": node_data.get("widgets", {}),
+                    "outputs": node_data.get("outputs", {}),
+                    "tooltips": node_data.get("tooltips", {}),
+                    "_source_file": node_data.get("_source_file", "")
+                }
+                # 签名不含来源文件：同一节点在不同插件中的路径不同
+                signature = json.dumps([node["_class_name"], node["title"], node["inputs"], node["widgets"],
+                                        node["outputs"], node["tooltips"]], ensure_ascii=False, sort_keys=True)
+                if signature in first_key:
+                    duplicates[key] = (first_key[signature], node)
+                else:
+                    first_key[signature] = key
+                    merged[key] = node
+        translated = self.translator._translate_with_fallback(merged, self.update_progress)
+        corrected = self.translator._strict_validate_and_correct_batch(merged, translated)
+        for key, (source_key, node) in duplicates.items():
+            corrected[key] = dict(corrected[source_key], _mapped_name=node["_mapped_name"],
+                                  _source_file=node["_source_file"])
+        results = [{} for _ in items]
+        for key, value in corrected.items():
+            idx, _, node_name = key.partition(sep)
+            results[int(idx)][node_name] = value
+        for (plugin_id, _), result in zip(items, results):
+            self.on_done(plugin_id, result)
 
 class ComfyUITranslator:
+    CONFIG_FLUSH_DELAY_MS = 500  # 配置修改后延迟写盘的时间
+    LOG_MAX_LINES = 2000  # 翻译日志最多保留的行数
+    LOG_TRIM_LINES = 500  # 超出上限时一次删除的行数
+    UI_DRAIN_INTERVAL_MS = 33  # 后台线程的日志/状态更新合并后刷新到界面的间隔（约 30 Hz）
+    ASK_WAIT_POLL_SEC = 0.2  # 后台线程等待主线程确认框时检查停止/关闭的间隔
+    MODELS_CACHE_TTL = 30  # 模型列表缓存有效期(秒)
+    MODELS_REQUEST_TIMEOUT = (3, 10)  # 获取模型列表的 (连接超时, 读取超时)
+
     def __init__(self, root):
         self.root = root
         self.root.title("comfyui插件翻译-ZYF修改版")
         
+        # 在后台线程读取配置文件，与主题和窗口布局的设置并行进行
+        config_pool = ThreadPoolExecutor(max_workers=1)
+        self._config_future = config_pool.submit(self._load_config)
+        config_pool.shutdown(wait=False)
+        
         # 设置暗色主题
         self._setup_theme()
         
@@ -326,9 +650,25 @@ class ComfyUITranslator:
         self.main_frame.grid_rowconfigure(0, weight=1)
         self.main_frame.grid_columnconfigure(0, weight=1)
         
-        # 加载配置
-        self.config = self._load_config()
+        # 加载配置（等待后台读取完成）
+        self.config = self._config_future.result()
+        self._ensure_config_schema()
+        # 配置写盘：修改后延迟合并，由单线程写入器按顺序写出
+        self._config_dirty = False
+        self._config_flush_scheduled = False
+        self._config_writer = ThreadPoolExecutor(max_workers=1)
+        # 窗口正在关闭：后台线程据此停止等待主线程的应答
+        self._closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.translation_services = TranslationServices()
+        self._translator_classes = {}
+        self._models_cache = {}  # (服务名, 服务器地址) -> (获取时间, 模型列表)
+        self._history_sets = {}  # 服务名 -> 模型历史集合（按需构建）
+        self._parsed_cache = {}  # 插件目录 -> (目录修改时间, 解析结果)，检测与翻译阶段共用
+        # 后台线程产生的日志行与状态变量更新，由 _drain_ui_updates 在主线程批量写入
+        self._log_queue = deque()
+        self._pending_vars = {}  # StringVar -> 最新值
+        self._ui_drain_pending = False
         
         # 创建标签页
         self.tab_control = ttk.Notebook(self.main_frame)
@@ -338,8 +678,11 @@ class ComfyUITranslator:
         self.translation_tab = ttk.Frame(self.tab_control)
         self.tab_control.add(self.translation_tab, text="翻译功能")
         
-        self.diff_tab = DiffTab(self.tab_control)
-        self.tab_control.add(self.diff_tab, text="对比功能")
+        # 对比功能页在首次切换到该页时才导入并创建
+        self.diff_tab_frame = ttk.Frame(self.tab_control)
+        self.tab_control.add(self.diff_tab_frame, text="对比功能")
+        self.diff_tab = None
+        self.tab_control.bind('<<NotebookTabChanged>>', self._on_tab_changed)
         
         self.console_tab = ttk.Frame(self.tab_control)
         self.tab_control.add(self.console_tab, text="控制台")
@@ -380,80 +723,107 @@ class ComfyUITranslator:
         select_bg = "#4b6eaf"
         panel_bg = "#8fa5b1"
         
-        # 配置全局样式
-        style.configure(".", 
-            background=bg_color, 
-            foreground=fg_color,
-            fieldbackground=field_bg,
-            troughcolor=bg_color,
-            selectbackground=select_bg
-        )
-        
-        # 配置特定组件
-        style.configure("TFrame", background=bg_color)
-        style.configure("TLabel", background=bg_color, foreground=fg_color)
-        style.configure("TButton", 
-            background=field_bg, 
-            foreground=fg_color,
-            borderwidth=1,
-            focusthickness=3,
-            focuscolor=select_bg
-        )
-        # 专用于图标按钮，移除额外内边距和焦点粗边框以使图标居中
-        style.configure("Icon.TButton",
-            background=field_bg,
-            foreground=fg_color,
-            padding=(4, 2),
-            focusthickness=0,
-            anchor="center"
-        )
-        style.map("TButton",
-            background=[("active", "#4c5052"), ("pressed", "#5c6164")],
-            foreground=[("disabled", "#808080")]
-        )
-        
-        style.configure("TEntry", 
-            fieldbackground=field_bg,
-            foreground=fg_color,
-            insertcolor=fg_color
-        )
-        
-        style.configure("TCombobox", 
-            fieldbackground=field_bg,
-            background=field_bg,
-            foreground=fg_color,
-            arrowcolor=fg_color
-        )
-        style.map("TCombobox",
-            fieldbackground=[("readonly", field_bg)],
-            selectbackground=[("readonly", select_bg)],
-            selectforeground=[("readonly", fg_color)]
-        )
-        
-        style.configure("TLabelframe", 
-            background=bg_color, 
-            foreground=fg_color,
-            labelmargins=(5, 0)
-        )
-        style.configure("TLabelframe.Label", 
-            background=bg_color, 
-            foreground=fg_color
-        )
-        
-        style.configure("TNotebook", background=bg_color, tabmargins=[2, 5, 2, 0])
-        style.configure("TNotebook.Tab", 
-            background=field_bg, 
-            foreground=fg_color, 
-            padding=[10, 2]
-        )
-        style.map("TNotebook.Tab", 
-            background=[["selected", field_bg]], 
-            expand=[["selected", [1, 1, 1, 0]]]
-        )
+        # 所有样式汇总为一个字典，通过 theme_settings 一次性写入当前主题
+        settings = {
+            # 配置全局样式
+            ".": {"configure": {
+                "background": bg_color,
+                "foreground": fg_color,
+                "fieldbackground": field_bg,
+                "troughcolor": bg_color,
+                "selectbackground": select_bg,
+            }},
+            # 配置特定组件
+            "TFrame": {"configure": {"background": bg_color}},
+            "TLabel": {"configure": {"background": bg_color, "foreground": fg_color}},
+            "TButton": {
+                "configure": {
+                    "background": field_bg,
+                    "foreground": fg_color,
+                    "borderwidth": 1,
+                    "focusthickness": 3,
+                    "focuscolor": select_bg,
+                },
+                "map": {
+                    "background": [("active", "#4c5052"), ("pressed", "#5c6164")],
+                    "foreground": [("disabled", "#808080")],
+                },
+            },
+            # 专用于图标按钮，移除额外内边距和焦点粗边框以使图标居中
+            "Icon.TButton": {"configure": {
+                "background": field_bg,
+                "foreground": fg_color,
+                "padding": (4, 2),
+                "focusthickness": 0,
+                "anchor": "center",
+            }},
+            "TEntry": {"configure": {
+                "fieldbackground": field_bg,
+                "foreground": fg_color,
+                "insertcolor": fg_color,
+            }},
+            "TCombobox": {
+                "configure": {
+                    "fieldbackground": field_bg,
+                    "background": field_bg,
+                    "foreground": fg_color,
+                    "arrowcolor": fg_color,
+                },
+                "map": {
+                    "fieldbackground": [("readonly", field_bg)],
+                    "selectbackground": [("readonly", select_bg)],
+                    "selectforeground": [("readonly", fg_color)],
+                },
+            },
+            "TLabelframe": {"configure": {
+                "background": bg_color,
+                "foreground": fg_color,
+                "labelmargins": (5, 0),
+            }},
+            "TLabelframe.Label": {"configure": {"background": bg_color, "foreground": fg_color}},
+            "TNotebook": {"configure": {"background": bg_color, "tabmargins": [2, 5, 2, 0]}},
+            "TNotebook.Tab": {
+                "configure": {
+                    "background": field_bg,
+                    "foreground": fg_color,
+                    "padding": [10, 2],
+                },
+                "map": {
+                    "background": [["selected", field_bg]],
+                    "expand": [["selected", [1, 1, 1, 0]]],
+                },
+            },
+            # 控制台日志列表
+            "Console.Treeview": {"configure": {
+                "background": field_bg,
+                "fieldbackground": field_bg,
+                "foreground": fg_color,
+            }},
+        }
+        style.theme_settings(style.theme_use(), settings)
 
         # 设置根窗口背景
         self.root.configure(bg=bg_color)
 
+    def _get_translator_class(self, name):
+        """按服务名获取专用翻译器类，首次使用时才导入对应模块"""
+        cls = self._translator_classes.get(name)
+        if cls is None:
+            module_name, class_name = _TRANSLATOR_MODULES[name]
+            cls = getattr(importlib.import_module(module_name), class_name)
+            self._translator_classes[name] = cls
+        return cls
+
+    def _on_tab_changed(self, event=None):
+        """首次切换到对比功能页时再导入并创建 DiffTab"""
+        if self.diff_tab is not None:
+            return
+        if self.tab_control.select() != str(self.diff_tab_frame):
+            return
+        from src.diff_tab import DiffTab
+        self.diff_tab = DiffTab(self.diff_tab_frame)
+        self.diff_tab.pack(fill=tk.BOTH, expand=True)
+
     def center_toplevel(self, window, width, height):
         """居中显示弹窗"""
         screen_width = window.winfo_screenwidth()
@@ -481,6 +851,8 @@ class ComfyUITranslator:
             enabled = self.translation_services.get_enabled_services()
             self.service_map = {s.label: s.name for s in enabled}
             service_labels = [s.label for s in enabled]
+        # 服务名 -> 显示标签
+        self._service_reverse_map = {name: label for label, name in self.service_map.items()}
         
         self.service_label_var = tk.StringVar()
         self.service_combobox = ttk.Combobox(
@@ -514,6 +886,13 @@ class ComfyUITranslator:
         # 初始化各服务配置控件
         self.service_widgets = {} # 存储各服务的控件变量
         self.service_frames = {}  # 存储各服务的Frame
+        self._current_service_frame = None  # 当前已显示的服务Frame
+        
+        # 循环外先取出各配置段，循环内只做一层查找
+        api_configs = self.config.get("api_configs", _EMPTY)
+        api_keys = self.config.get("api_keys", _EMPTY)
+        model_ids = self.config.get("model_ids", _EMPTY)
+        model_history = self.config.get("model_history", _EMPTY)
         
         for name, service in self.translation_services.services.items():
             frame = ttk.Frame(self.service_configs)
@@ -526,10 +905,10 @@ class ComfyUITranslator:
                 ttk.Label(frame, text="服务器:", width=8).pack(side=tk.LEFT)
                 if name == "custom":
                     # 自定义服务没有默认 base_url
-                    default_base = self.config.get("api_configs", {}).get("custom", {}).get("base_url", "")
+                    default_base = api_configs.get("custom", _EMPTY).get("base_url", "")
                 else:
                     default_base = getattr(service, "api_base", service.base_url or ("http://localhost:1234" if name == "lmstudio" else "http://localhost:11434"))
-                host_var = tk.StringVar(value=self.config.get("api_configs", {}).get(name, {}).get("base_url", default_base))
+                host_var = tk.StringVar(value=api_configs.get(name, _EMPTY).get("base_url", default_base))
                 host_entry = ttk.Entry(frame, textvariable=host_var, width=40)
                 host_entry.pack(side=tk.LEFT, padx=5)
                 widgets["host"] = host_var
@@ -537,7 +916,7 @@ class ComfyUITranslator:
             # 2. API Key (非本地服务 + 自定义服务)
             if name not in ["ollama", "lmstudio"]:
                 ttk.Label(frame, text="API密钥:", width=8).pack(side=tk.LEFT)
-                key_var = tk.StringVar(value=self.config.get("api_keys", {}).get(name, ""))
+                key_var = tk.StringVar(value=api_keys.get(name, ""))
                 key_entry = ttk.Entry(frame, textvariable=key_var, width=40)
                 try:
                     key_entry.configure(show="*")
@@ -552,7 +931,7 @@ class ComfyUITranslator:
 
             # 3. 模型选择/输入
             ttk.Label(frame, text="模型:", width=6).pack(side=tk.LEFT, padx=(10, 0))
-            model_var = tk.StringVar(value=self.config.get("model_ids", {}).get(name, service.default_model))
+            model_var = tk.StringVar(value=model_ids.get(name, service.default_model))
             widgets["model"] = model_var
 
             # 本地服务始终创建下拉框（即使为空，刷新后填充）
@@ -561,7 +940,7 @@ class ComfyUITranslator:
                 model_combo.pack(side=tk.LEFT, padx=5)
                 widgets["model_combo"] = model_combo
             else:
-                history_values = self.config.get("model_history", {}).get(name, [])
+                history_values = model_history.get(name, ())
                 initial_values = history_values if history_values else (service.models if service.models else ([service.default_model] if service.default_model else []))
                 model_combo = ttk.Combobox(frame, textvariable=model_var, values=initial_values, width=30)
                 model_combo.pack(side=tk.LEFT, padx=5)
@@ -681,8 +1060,9 @@ class ComfyUITranslator:
         log_frame = ttk.Frame(self.translation_tab)
         log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, bg="#87baab", fg="#000000")
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=15, bg="#87baab", fg="#000000", state='disabled')
         self.log_text.pack(fill=tk.BOTH, expand=True)
+        self._log_line_count = 0
         
         self.detail_text = scrolledtext.ScrolledText(log_frame, height=15) # 隐藏的详细日志
         self.strategy_status = tk.StringVar()
@@ -817,7 +1197,6 @@ class ComfyUITranslator:
                 return
 
             # 持久化(避免触发 _save_config 中还未实例化的温度校验)
-            self.config.setdefault("translation_params", {})
             self.config["translation_params"]["batch_size"] = bs
             self.config["translation_params"]["rounds"] = rd
             self.config["translation_params"]["cooldown_sec"] = cd
@@ -825,12 +1204,7 @@ class ComfyUITranslator:
             self.config["translation_params"]["temperature"] = tp
             self.config["translation_params"]["top_p"] = tpp
             self.config["translation_params"]["only_tooltips"] = bool(self.only_tooltips.get())
-            try:
-                with open('config.json', 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=4, ensure_ascii=False)
-            except Exception as e:
-                messagebox.showerror("错误", f"保存失败: {e}", parent=top)
-                return
+            self._mark_config_dirty()
             top.destroy()
 
         ttk.Button(btn_row, text="保存", width=10, command=on_save).pack(side=tk.RIGHT, padx=5)
@@ -846,7 +1220,7 @@ class ComfyUITranslator:
         top.configure(bg=bg_color)
         
         # 居中显示
-        self.center_toplevel(top, 450, 600)
+        self.center_toplevel(top, 450, 660)
         
         policy = self._load_error_policy()
         
@@ -891,7 +1265,14 @@ class ComfyUITranslator:
         delay_scale = ttk.Scale(delay_frame, from_=0, to=60, variable=delay_val, orient=tk.HORIZONTAL, command=update_delay_label)
         delay_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # 4. 备用模型优先级
+        # 4. 备用模型切换方式
+        ttk.Label(top, text="翻译失败时切换备用模型", background=bg_color).pack(anchor=tk.W, padx=10, pady=(10, 2))
+        switch_map = {"ask_once": "每次任务询问一次", "always": "自动切换", "never": "不切换"}
+        rev_switch_map = {v: k for k, v in switch_map.items()}
+        switch_var = tk.StringVar(value=switch_map.get(policy.get("fallback_switch"), "每次任务询问一次"))
+        ttk.Combobox(top, textvariable=switch_var, values=list(switch_map.values()), state="readonly").pack(fill=tk.X, padx=10)
+
+        # 5. 备用模型优先级
         ttk.Label(top, text="备用模型优先级(当前服务)", background=bg_color).pack(anchor=tk.W, padx=10, pady=(10, 5))
         label = self.service_combobox.get()
         service_name = self.service_map.get(label)
@@ -899,33 +1280,37 @@ class ComfyUITranslator:
         hist = self.config.get("model_history", {}).get(service_name, [])
         items = backups if backups else hist
         
+        # Python 侧维护与 Listbox 一致的模型列表，调整顺序时无需从控件读回
+        items_list = list(items)
         lb = tk.Listbox(top, bg=field_bg, fg="#000000", selectmode=tk.SINGLE, height=10)
-        for m in items:
-            lb.insert(tk.END, m)
+        if items_list:
+            lb.insert(tk.END, *items_list)
         lb.pack(fill=tk.BOTH, expand=True, padx=10)
         
         btns = ttk.Frame(top)
         btns.pack(fill=tk.X, padx=10, pady=10)
         
+        def swap_items(i, j):
+            """交换第 i、j 项并选中第 j 项"""
+            items_list[i], items_list[j] = items_list[j], items_list[i]
+            lb.delete(0, tk.END)
+            lb.insert(tk.END, *items_list)
+            lb.selection_set(j)
+            lb.see(j)
+        
         def move_up():
             sel = lb.curselection()
             if not sel: return
             i = sel[0]
             if i == 0: return
-            text = lb.get(i)
-            lb.delete(i)
-            lb.insert(i-1, text)
-            lb.selection_set(i-1)
+            swap_items(i, i-1)
         
         def move_down():
             sel = lb.curselection()
             if not sel: return
             i = sel[0]
-            if i >= lb.size()-1: return
-            text = lb.get(i)
-            lb.delete(i)
-            lb.insert(i+1, text)
-            lb.selection_set(i+1)
+            if i >= len(items_list)-1: return
+            swap_items(i, i+1)
             
         ttk.Button(btns, text="上移", command=move_up).pack(side=tk.LEFT)
         ttk.Button(btns, text="下移", command=move_down).pack(side=tk.LEFT, padx=10)
@@ -935,15 +1320,14 @@ class ComfyUITranslator:
                 new_policy = {
                     "strategy": rev_strategy_map.get(strategy_var.get(), "exponential"),
                     "max_retries": int(retries_scale.get()),
-                    "base_delay_sec": int(delay_scale.get())
+                    "base_delay_sec": int(delay_scale.get()),
+                    "fallback_switch": rev_switch_map.get(switch_var.get(), "ask_once")
                 }
                 self.config["error_policy"] = new_policy
-                arr = [lb.get(i) for i in range(lb.size())]
-                if "backup_models" not in self.config: self.config["backup_models"] = {}
+                arr = list(items_list)
                 self.config["backup_models"][service_name] = arr
                 
-                with open('config.json', 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=4, ensure_ascii=False)
+                self._mark_config_dirty()
                 messagebox.showinfo("已保存", "错误策略与备用模型优先级已保存")
                 top.destroy()
             except Exception as e:
@@ -957,28 +1341,27 @@ class ComfyUITranslator:
         saved_service = self.config.get("current_service", "doubao")
         # 尝试匹配并加载
         found = False
-        for label, name in self.service_map.items():
-            if name == saved_service:
-                try:
-                    self.service_label_var.set(label)
-                    self.service_combobox.set(label)
-                    self.on_service_change()
-                    found = True
-                    api_cfg = self.config.get("api_configs", {}).get(saved_service, {})
-                    if api_cfg and hasattr(self, "only_tooltips"):
-                        self.only_tooltips.set(bool(api_cfg.get("only_tooltips")))
-                except Exception as e:
-                    self.log(f"加载服务 {saved_service} 失败: {e}")
-                break
+        label = self._service_reverse_map.get(saved_service)
+        if label is not None:
+            try:
+                self.service_label_var.set(label)
+                self.service_combobox.set(label)
+                self.on_service_change()
+                found = True
+                api_cfg = self.config.get("api_configs", {}).get(saved_service, {})
+                if api_cfg and hasattr(self, "only_tooltips"):
+                    self.only_tooltips.set(bool(api_cfg.get("only_tooltips")))
+            except Exception as e:
+                self.log(f"加载服务 {saved_service} 失败: {e}")
         
         if not found and self.service_map:
             # 默认选择第一个
             try:
-                first_label = list(self.service_map.keys())[0]
+                first_label = next(iter(self.service_map))
                 self.service_label_var.set(first_label)
                 self.service_combobox.set(first_label)
                 self.on_service_change()
-                api_cfg = self.config.get("api_configs", {}).get(first_label, {})
+                api_cfg = self.config.get("api_configs", {}).get(self.service_map[first_label], {})
                 if api_cfg and hasattr(self, "only_tooltips"):
                     self.only_tooltips.set(bool(api_cfg.get("only_tooltips")))
             except Exception as e:
@@ -993,15 +1376,16 @@ class ComfyUITranslator:
             service_name = self.service_map.get(label)
             if not service_name: return
 
-            # 1. 隐藏所有配置Frame
-            for frame in self.service_frames.values():
-                frame.pack_forget()
-
-            # 2. 显示当前服务Frame
-            if service_name in self.service_frames:
-                self.service_frames[service_name].pack(fill=tk.X)
+            # 1. 只隐藏当前显示的Frame，再显示新服务的Frame
+            frame = self.service_frames.get(service_name)
+            if frame is not self._current_service_frame:
+                if self._current_service_frame is not None:
+                    self._current_service_frame.pack_forget()
+                if frame is not None:
+                    frame.pack(fill=tk.X)
+                self._current_service_frame = frame
 
-            # 3. 更新API链接 (自定义服务无统一链接,隐藏)
+            # 2. 更新API链接 (自定义服务无统一链接,隐藏)
             service_config = self.translation_services.get_service(service_name)
             if service_name == "custom":
                 self.api_url_label.config(text="自定义OpenAI兼容服务", state="disabled", cursor="")
@@ -1013,7 +1397,7 @@ class ComfyUITranslator:
                 self.api_url_label.config(text="", state="disabled", cursor="")
                 self.current_api_url = ""
 
-            # 4. 卸载按钮显示 (仅本地 ollama/lmstudio 支持,自定义服务不显示)
+            # 3. 卸载按钮显示 (仅本地 ollama/lmstudio 支持,自定义服务不显示)
             if service_name in ["ollama", "lmstudio"]:
                 self.unload_model_btn.pack(side=tk.LEFT, padx=5)
             else:
@@ -1033,25 +1417,31 @@ class ComfyUITranslator:
 
         btn = widgets["refresh_btn"]
         btn.config(state="disabled", text="刷新中...")
+        host = widgets["host"].get().strip()
 
         def task():
             try:
-                models = []
-                if service_name == "ollama":
-                    host = widgets["host"].get().strip()
-                    translator = OllamaTranslator(base_url=host, model_id="")
-                    models = translator.get_available_models()
-                elif service_name == "lmstudio":
-                    host = widgets["host"].get().strip()
-                    translator = LMStudioTranslator(base_url=host, model_id="")
-                    models = translator.get_available_models()
-                elif service_name == "custom":
-                    # 自定义服务: 尝试通过 OpenAI 兼容协议 /v1/models 获取
-                    base_url = widgets["host"].get().strip()
-                    api_key = widgets.get("api_key").get().strip() if "api_key" in widgets else ""
-                    if not base_url:
-                        raise Exception("请先填写服务器地址")
-                    models = self._fetch_custom_models(base_url, api_key)
+                # 短时间内重复刷新同一服务器时直接使用缓存结果
+                cache_key = (service_name, host)
+                cached = self._models_cache.get(cache_key)
+                if cached and time.monotonic() - cached[0] < self.MODELS_CACHE_TTL:
+                    models = cached[1]
+                else:
+                    models = []
+                    if service_name == "ollama":
+                        translator = self._get_translator_class("ollama")(base_url=host, model_id="")
+                        models = translator.get_available_models(timeout=self.MODELS_REQUEST_TIMEOUT)
+                    elif service_name == "lmstudio":
+                        translator = self._get_translator_class("lmstudio")(base_url=host, model_id="")
+                        models = translator.get_available_models(timeout=self.MODELS_REQUEST_TIMEOUT)
+                    elif service_name == "custom":
+                        # 自定义服务: 尝试通过 OpenAI 兼容协议 /v1/models 获取
+                        api_key = widgets.get("api_key").get().strip() if "api_key" in widgets else ""
+                        if not host:
+                            raise Exception("请先填写服务器地址")
+                        models = self._fetch_custom_models(host, api_key, timeout=self.MODELS_REQUEST_TIMEOUT)
+                    if models:
+                        self._models_cache[cache_key] = (time.monotonic(), models)
 
 
                 def update_ui():
@@ -1074,12 +1464,13 @@ class ComfyUITranslator:
 
         threading.Thread(target=task, daemon=True).start()
 
-    def _fetch_custom_models(self, base_url: str, api_key: str) -> list:
+    def _fetch_custom_models(self, base_url: str, api_key: str, timeout=15) -> list:
         """通过 OpenAI 兼容协议获取自定义服务的模型列表
 
         Args:
             base_url: 用户输入的服务基础地址,例如 http://localhost:8080/v1
             api_key: 可选,部分本地服务无需 Key
+            timeout: 请求超时，可为秒数或 (连接超时, 读取超时)
 
         Returns:
             模型 ID 列表
@@ -1092,7 +1483,7 @@ class ComfyUITranslator:
         headers = {}
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = requests.get(url, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             raise Exception(f"GET {url} 失败, 状态码: {resp.status_code}")
         data = resp.json()
@@ -1119,14 +1510,12 @@ class ComfyUITranslator:
             return
         hist_map = self.config.get("model_history", {})
         hist = hist_map.get(service_name, [])
-        if selected in hist:
+        seen = self._history_set(service_name)
+        if selected in seen:
+            seen.discard(selected)
             hist = [m for m in hist if m != selected]
-            self.config.setdefault("model_history", {})[service_name] = hist
-            try:
-                with open('config.json', 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=4, ensure_ascii=False)
-            except Exception as e:
-                self.log(f"保存配置失败: {e}")
+            self.config["model_history"][service_name] = hist
+            self._mark_config_dirty()
             self.update_history_combobox(service_name)
             if widgets.get("model") and widgets["model"].get().strip() == selected:
                 widgets["model"].set("")
@@ -1177,9 +1566,11 @@ class ComfyUITranslator:
         # 备用模型优先级
         backups = self.config.get("backup_models", {}).get(service_name, [])
         hist = self.config.get("model_history", {}).get(service_name, [])
-        fallback_models = [m for m in backups if m and m != config["model_id"]]
+        # 一次遍历完成过滤与去重（排除当前模型和重复项）
+        seen = {config["model_id"]}
+        fallback_models = [m for m in backups if m and not (m in seen or seen.add(m))]
         if not fallback_models:
-            fallback_models = [m for m in hist if m and m != config["model_id"]]
+            fallback_models = [m for m in hist if m and not (m in seen or seen.add(m))]
         config["fallback_models"] = fallback_models
         
         return config
@@ -1213,13 +1604,13 @@ class ComfyUITranslator:
                 # 自定义服务本地 llamacpp 等可能不需要真实 API Key,使用占位
                 effective_api_key = cfg["api_key"] or "EMPTY"
                 if cfg["name"] == "ollama":
-                    t = OllamaTranslator(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
+                    t = self._get_translator_class("ollama")(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
                     success = t.test_connection()
                 elif cfg["name"] == "lmstudio":
-                    t = LMStudioTranslator(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
+                    t = self._get_translator_class("lmstudio")(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
                     success = t.test_connection()
                 elif cfg["name"] == "siliconflow":
-                    t = SiliconFlowTranslator(api_key=cfg["api_key"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
+                    t = self._get_translator_class("siliconflow")(api_key=cfg["api_key"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
                     success = t.test_connection()
                 else:
                     # 通用 OpenAI 兼容测试 (含 custom)
@@ -1229,7 +1620,7 @@ class ComfyUITranslator:
                 def on_finish():
                     if success:
                         self.log("API 连接测试成功！")
-                        self._save_config() # 保存配置
+                        self._save_config(cfg) # 保存配置(复用测试时读取的配置)
                     else:
                         self.log("API 连接测试失败")
                     self.test_api_btn.config(state="normal", text="测试API")
@@ -1243,17 +1634,15 @@ class ComfyUITranslator:
         
         threading.Thread(target=task, daemon=True).start()
 
-    def _save_config(self):
-        """保存当前配置到 config.json"""
-        cfg = self.get_current_service_config()
-        if not cfg: return
+    def _save_config(self, cfg=None):
+        """保存当前配置到 config.json
 
-        # 更新 self.config
-        if "api_keys" not in self.config: self.config["api_keys"] = {}
-        if "model_ids" not in self.config: self.config["model_ids"] = {}
-        if "api_configs" not in self.config: self.config["api_configs"] = {}
-        if "model_history" not in self.config: self.config["model_history"] = {}
+        cfg: 调用方已通过 get_current_service_config() 取得的配置,传入可避免重复读取控件
+        """
+        cfg = cfg or self.get_current_service_config()
+        if not cfg: return
 
+        # 更新 self.config (各配置段已由 _ensure_config_schema 保证存在)
         name = cfg["name"]
         self.config["current_service"] = name
         self.config["model_ids"][name] = cfg["model_id"]
@@ -1281,11 +1670,9 @@ class ComfyUITranslator:
         # 保存错误策略
         self.config["error_policy"] = cfg.get("error_policy", self.config.get("error_policy", {}))
         # 保存备用模型优先级
-        if "backup_models" not in self.config: self.config["backup_models"] = {}
         self.config["backup_models"][name] = cfg.get("fallback_models", self.config["backup_models"].get(name, []))
 
         # 保存翻译参数(并发、轮次、冷却)
-        if "translation_params" not in self.config: self.config["translation_params"] = {}
         try:
             self.config["translation_params"]["batch_size"] = int(self.batch_size.get())
             self.config["translation_params"]["rounds"] = int(self.rounds.get())
@@ -1294,11 +1681,7 @@ class ComfyUITranslator:
         except Exception:
             pass
 
-        try:
-            with open('config.json', 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            self.log(f"保存配置失败: {e}")
+        self._mark_config_dirty()
 
         self.update_history_combobox(name)
 
@@ -1310,60 +1693,116 @@ class ComfyUITranslator:
         """
         if not path:
             return
-        try:
-            self.config["last_open_dir"] = path
-            with open('config.json', 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            self.log(f"保存最近目录失败: {e}")
+        self.config["last_open_dir"] = path
+        self._mark_config_dirty()
 
     def _load_error_policy(self):
         policy = self.config.get("error_policy", {})
         if "max_retries" not in policy: policy["max_retries"] = 5
         if "base_delay_sec" not in policy: policy["base_delay_sec"] = 2
         if "strategy" not in policy: policy["strategy"] = "exponential"
+        if "fallback_switch" not in policy: policy["fallback_switch"] = "ask_once"
         return policy
 
     def _parse_error_info(self, err_text: str) -> dict:
         info = {"code": None, "provider": None, "raw": None}
         try:
-            import re
-            m = re.search(r'Error code:\s*(\d+)', err_text)
+            m = _ERR_CODE_RE.search(err_text)
             if m: info["code"] = int(m.group(1))
-            p = re.search(r"provider_name['\"]?:\s*['\"]([^'\"]+)['\"]", err_text)
+            p = _ERR_PROVIDER_RE.search(err_text)
             if p: info["provider"] = p.group(1)
-            r = re.search(r"raw['\"]?:\s*['\"](.*?)['\"]", err_text)
+            r = _ERR_RAW_RE.search(err_text)
             if r: info["raw"] = r.group(1)
         except Exception:
             pass
         return info
 
+    def _history_set(self, service_name):
+        """模型历史的集合副本，用于 O(1) 判重；修改历史列表时需同步更新"""
+        seen = self._history_sets.get(service_name)
+        if seen is None:
+            seen = set(self.config.get("model_history", {}).get(service_name, ()))
+            self._history_sets[service_name] = seen
+        return seen
+
     def _add_model_to_history(self, service_name, model_id):
         if not model_id: return
-        hist = self.config.setdefault("model_history", {}).get(service_name, [])
-        if model_id not in hist:
-            hist.append(model_id)
-            self.config["model_history"][service_name] = hist
+        seen = self._history_set(service_name)
+        if model_id not in seen:
+            seen.add(model_id)
+            self.config["model_history"].setdefault(service_name, []).append(model_id)
 
     # --- 以下方法保持原有逻辑，只需做少量适配 ---
 
     def log(self, message):
-        """添加日志"""
+        """添加日志（任意线程均可调用，界面更新合并后由主线程批量写入）"""
         # 基于关键词添加图标前缀，以提升辨识度
-        icon = '📌'
-        mlow = message.lower()
-        if any(k in message for k in ['错误', '失败', '异常']) or any(k in mlow for k in ['error', 'failed']):
-            icon = '🚨'
-            logging.error(message)
-        elif any(k in message for k in ['警告', '注意']) or 'warn' in mlow:
-            icon = '⚠️'
-            logging.warning(message)
-        elif any(k in message for k in ['成功', '完成', '已保存', '已生成']) or any(k in mlow for k in ['success', 'done']):
-            icon = '😊'
-            logging.info(message)
-        else:
-            logging.info(message)
-        self.log_text.insert(tk.END, f"[{time.strftime('%H:%M:%S')}] {icon} {message}\n")
+        m = _LOG_KIND_RE.search(message)
+        icon, level = _LOG_KINDS[m.lastindex if m else 0]
+        logging.log(level, message)
+        self._log_queue.append(f"[{time.strftime('%H:%M:%S')}] {icon} {message}\n")
+        self._schedule_ui_drain()
+
+    def _ask_on_main_thread(self, title, message, cancel=None):
+        """供后台线程调用：在主线程弹出确认框并等待用户选择
+
+        窗口关闭或 cancel() 返回 True（如任务已停止）时不再等待，按“否”处理
+        """
+        answer = []
+        done = threading.Event()
+
+        def ask():
+            try:
+                answer.append(messagebox.askyesno(title, message, parent=self.root))
+            finally:
+                done.set()
+
+        try:
+            self.root.after(0, ask)
+        except (tk.TclError, RuntimeError):
+            return False  # 主窗口已销毁
+        while not done.wait(self.ASK_WAIT_POLL_SEC):
+            if self._closing or (cancel is not None and cancel()):
+                return False
+        return bool(answer and answer[0])
+
+    def _set_status_var(self, var, text):
+        """从后台线程设置状态栏变量：只保留最新值，随日志一起刷新"""
+        self._pending_vars[var] = text
+        self._schedule_ui_drain()
+
+    def _schedule_ui_drain(self):
+        if not self._ui_drain_pending:
+            self._ui_drain_pending = True
+            self.root.after(self.UI_DRAIN_INTERVAL_MS, self._drain_ui_updates)
+
+    def _drain_ui_updates(self):
+        """主线程：一次写入积压的日志行和状态变量"""
+        # 先清标志：此后入队的更新会安排下一次刷新，不会遗漏
+        self._ui_drain_pending = False
+        pending_vars = self._pending_vars
+        while pending_vars:
+            try:
+                var, text = pending_vars.popitem()
+            except KeyError:
+                break
+            var.set(text)
+        queue = self._log_queue
+        lines = []
+        while queue:
+            lines.append(queue.popleft())
+        if not lines:
+            return
+        chunk = ''.join(lines)
+        self.log_text.configure(state='normal')
+        self.log_text.insert(tk.END, chunk)
+        # 限制日志行数：超过上限时一次删除最旧的一批，避免文本控件越来越慢
+        self._log_line_count += chunk.count('\n')
+        if self._log_line_count > self.LOG_MAX_LINES:
+            trim = max(self.LOG_TRIM_LINES, self._log_line_count - self.LOG_MAX_LINES)
+            self.log_text.delete('1.0', f'{trim + 1}.0')
+            self._log_line_count -= trim
+        self.log_text.configure(state='disabled')
         self.log_text.see(tk.END)
 
     def toggle_api_key_visibility(self, entry_widget, btn_widget=None):
@@ -1443,7 +1882,7 @@ class ComfyUITranslator:
             sort_frame.pack(fill=tk.X, pady=4)
             
             # 列表数据容器
-            # items结构: [{'path': full_path, 'name': basename, 'mtime': timestamp}]
+            # items结构: [{'path': full_path, 'name': basename, 'name_key': 排序用名称, 'mtime': timestamp}]
             self.list_items = [] 
             
             def get_sort_icon(field):
@@ -1476,11 +1915,7 @@ class ComfyUITranslator:
                 
                 # 保存状态
                 self.config["sort_state"] = current_sort
-                try:
-                    with open('config.json', 'w', encoding='utf-8') as f:
-                        json.dump(self.config, f, indent=4, ensure_ascii=False)
-                except:
-                    pass
+                self._mark_config_dirty()
                 
                 update_sort_buttons()
                 refresh_list_view()
@@ -1528,6 +1963,18 @@ class ComfyUITranslator:
                     pass
                 return names
 
+            # 各排序方式的升序下标缓存，目录重新加载时清空
+            sort_orders = {}
+
+            def get_sort_order(field):
+                order = sort_orders.get(field)
+                if order is None:
+                    # 先取出排序键列表，再用其 __getitem__ 作为 key（全程走 C 实现）
+                    keys = list(map(itemgetter("mtime" if field == "time" else "name_key"), self.list_items))
+                    order = sorted(range(len(keys)), key=keys.__getitem__)
+                    sort_orders[field] = order
+                return order
+
             def refresh_list_view():
                 # 保存当前选中项的路径
                 selected_paths = set()
@@ -1536,67 +1983,109 @@ class ComfyUITranslator:
                     if i < len(current_paths):
                         selected_paths.add(current_paths[i])
                 
-                # 排序
-                sorted_items = list(self.list_items)
+                # 排序：使用缓存的升序下标，降序时直接反转
                 field = current_sort["field"]
                 direction = current_sort["direction"]
                 
-                if field == "name":
-                    sorted_items.sort(key=lambda x: x["name"].lower(), reverse=(direction == "desc"))
-                elif field == "time":
-                    sorted_items.sort(key=lambda x: x["mtime"], reverse=(direction == "desc"))
+                if field == "time":
+                    order = get_sort_order("time")
                 else:
                     # Default: sort by name asc (base order)
-                    sorted_items.sort(key=lambda x: x["name"].lower())
-
-                # 更新显示
-                lb.delete(0, tk.END)
-                current_paths.clear()
-                
-                first_sel_index = -1
-                
-                for idx, item in enumerate(sorted_items):
-                    lb.insert(tk.END, item["name"])
-                    current_paths.append(item["path"])
-                    # 如果该插件已翻译(在 zh-CN/Nodes 目录下有对应 json),显示为深绿色
-                    if item["name"] in translated_names:
-                        lb.itemconfig(idx, {"fg": "#1B7A3A"})
-                    # 恢复选中
-                    if item["path"] in selected_paths:
-                        lb.select_set(idx)
-                        if first_sel_index == -1:
-                            first_sel_index = idx
+                    order = get_sort_order("name")
+                if field in ("name", "time") and direction == "desc":
+                    order = order[::-1]
+                items = self.list_items
+                sorted_items = [items[i] for i in order]
+
+                # 重建期间断开滚动条联动，避免每次增删都回调刷新滚动条
+                lb.configure(yscrollcommand="")
+                try:
+                    # 更新显示：所有名称一次 insert 写入
+                    lb.delete(0, tk.END)
+                    if sorted_items:
+                        lb.insert(tk.END, *[item["name"] for item in sorted_items])
+                    current_paths[:] = [item["path"] for item in sorted_items]
+                    
+                    sel_indices = []
+                    for idx, item in enumerate(sorted_items):
+                        # 如果该插件已翻译(在 zh-CN/Nodes 目录下有对应 json),显示为深绿色
+                        if item["name"] in translated_names:
+                            lb.itemconfig(idx, {"fg": "#1B7A3A"})
+                        # 记录需要恢复选中的行
+                        if item["path"] in selected_paths:
+                            sel_indices.append(idx)
+                    
+                    # 恢复选中：连续的行合并为一个区间设置
+                    if sel_indices:
+                        start = prev = sel_indices[0]
+                        for idx in sel_indices[1:]:
+                            if idx != prev + 1:
+                                lb.selection_set(start, prev)
+                                start = idx
+                            prev = idx
+                        lb.selection_set(start, prev)
+                finally:
+                    lb.configure(yscrollcommand=sb.set)
                 
                 # 确保选中项可见
-                if first_sel_index != -1:
-                    lb.see(first_sel_index)
+                if sel_indices:
+                    lb.see(sel_indices[0])
+
+            # 扫描序号：目录切换后丢弃过期的后台扫描结果
+            scan_seq = [0]
+
+            def scan_dir(base):
+                """扫描目录并缓存元数据，返回 (已翻译名称集合, 条目列表)"""
+                # 扫描已翻译的插件(json 文件名集合)
+                names = scan_translated_plugins(base)
+                # scandir 的目录项自带 stat 缓存（Windows 上无需额外系统调用）
+                items = []
+                with os.scandir(base) as it:
+                    for entry in it:
+                        try:
+                            mtime = entry.stat().st_mtime
+                        except OSError:
+                            mtime = 0
+                        name = entry.name
+                        items.append({
+                            "name": name,
+                            "name_key": name.casefold(),  # 预先计算的排序键
+                            "path": entry.path,
+                            "mtime": mtime
+                        })
+                return names, items
 
             def load_dirs():
-                nonlocal translated_names
                 self.list_items.clear()
+                sort_orders.clear()
+                scan_seq[0] += 1
+                seq = scan_seq[0]
                 base = root_var.get()
                 if not base or not os.path.isdir(base):
                     return
-                try:
-                    # 扫描已翻译的插件(json 文件名集合)
-                    translated_names = scan_translated_plugins(base)
-                    # 获取文件列表并缓存元数据
-                    raw_items = os.listdir(base)
-                    for name in raw_items:
-                        full_path = os.path.join(base, name)
-                        try:
-                            mtime = os.path.getmtime(full_path)
-                        except:
-                            mtime = 0
-                        self.list_items.append({
-                            "name": name,
-                            "path": full_path,
-                            "mtime": mtime
-                        })
 
-                    refresh_list_view()
-                except Exception:
-                    pass
+                # 大目录扫描放到后台线程，完成后回到 UI 线程刷新列表
+                def task():
+                    try:
+                        result = scan_dir(base)
+                    except Exception:
+                        return
+
+                    def apply():
+                        nonlocal translated_names
+                        if seq != scan_seq[0]:
+                            return
+                        translated_names, items = result
+                        self.list_items[:] = items
+                        sort_orders.clear()
+                        refresh_list_view()
+
+                    try:
+                        top.after(0, apply)
+                    except Exception:
+                        pass  # 窗口已关闭
+
+                threading.Thread(target=task, daemon=True).start()
 
             def select_all(event=None):
                 lb.select_set(0, tk.END)
@@ -1625,11 +2114,7 @@ class ComfyUITranslator:
                 self.clear_folders_btn.config(state=tk.NORMAL)
                 # 记忆路径
                 self.config["last_open_dir"] = root_var.get()
-                try:
-                    with open('config.json', 'w', encoding='utf-8') as f:
-                        json.dump(self.config, f, indent=4, ensure_ascii=False)
-                except Exception:
-                    pass
+                self._mark_config_dirty()
                 top.destroy()
 
             ttk.Button(btns, text="全选", command=select_all).pack(side=tk.LEFT)
@@ -1731,19 +2216,29 @@ class ComfyUITranslator:
             self.log(f"开始检测 {total} 个插件...")
             
             self.detected_nodes = {}
-            for i, folder in enumerate(self.plugin_folders, 1):
-                name = os.path.basename(folder)
-                self.log(f"[{i}/{total}] 检测插件: {name}")
-                
-                parser = NodeParser(folder)
-                nodes = parser.parse_folder(folder)
-                nodes = parser.optimize_node_info(nodes)
-                
-                outfile = os.path.join(nodes_dir, f'{name}_nodes.json')
-                FileUtils.save_json(nodes, outfile)
-                
-                self.detected_nodes.update(nodes)
-                self.log(f"  - 发现 {len(nodes)} 个节点")
+            # 解析是纯 Python 的 CPU 密集任务，多个插件时用进程池并行解析，按完成顺序处理结果
+            if total > 1:
+                executor = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, total))
+                futures = [executor.submit(_parse_one, folder) for folder in self.plugin_folders]
+                results = (future.result() for future in as_completed(futures))
+            else:
+                executor = None
+                # 只有一个插件时在插件内按文件并行解析
+                results = (_parse_one(folder, parallel=True) for folder in self.plugin_folders)
+            try:
+                for i, (folder, mtime, nodes) in enumerate(results, 1):
+                    name = os.path.basename(folder)
+                    self.log(f"[{i}/{total}] 检测插件: {name}")
+                    self._parsed_cache[folder] = (mtime, nodes)
+
+                    outfile = os.path.join(nodes_dir, f'{name}_nodes.json')
+                    FileUtils.save_json(nodes, outfile)
+
+                    self.detected_nodes.update(nodes)
+                    self.log(f"  - 发现 {len(nodes)} 个节点")
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
             
             self.log(f"检测完成，共 {len(self.detected_nodes)} 个节点")
             
@@ -1761,6 +2256,23 @@ class ComfyUITranslator:
                 self._update_start_button_text()
             ])
 
+    def _parse_plugin(self, folder):
+        """解析插件节点并缓存结果"""
+        _, mtime, nodes = _parse_one(folder)
+        self._parsed_cache[folder] = (mtime, nodes)
+        return nodes
+
+    def _get_parsed_nodes(self, folder):
+        """返回插件的解析结果：检测阶段已解析且目录未修改时直接复用，否则重新解析"""
+        cached = self._parsed_cache.get(folder)
+        if cached is not None:
+            try:
+                if os.path.getmtime(folder) == cached[0]:
+                    return cached[1]
+            except OSError:
+                pass
+        return self._parse_plugin(folder)
+
     def toggle_translation(self):
         if self.translating:
             self.stop_translation()
@@ -1817,7 +2329,7 @@ class ComfyUITranslator:
             return
 
         # temperature / top_p 已在 get_current_service_config 中从 StringVar 读取并校验,无需重复
-        self._save_config()
+        self._save_config(cfg)
 
         # 如果不是继续翻译(=从头翻译),清理所有插件的 checkpoint 和会话临时目录
         if not resume:
@@ -1872,87 +2384,189 @@ class ComfyUITranslator:
             failed = []
             curr_batch_size = batch_size
             
-            folders_to_process = target_folders if target_folders is not None else self.plugin_folders
+            # 去重并保持顺序：同一插件并发翻译会争用同一个 _temp 目录和 checkpoint
+            folders_to_process = list(dict.fromkeys(target_folders if target_folders is not None else self.plugin_folders))
 
             # 新任务(非继续)清空失败记录;继续翻译在 start_translation 已清空
             if target_folders is None and not resume:
                 self.failed_records = []
 
             total_folders = len(folders_to_process)
-            
-            for i, folder in enumerate(folders_to_process, 1):
-                if not self.translating: break
-
+            # 预先算好各插件的 (目录, 名称, 输出目录) 并一次性创建输出目录
+            plugin_meta = []
+            for folder in folders_to_process:
                 name = os.path.basename(folder)
-                # 每个插件开始时清空冷却标签,避免上一插件的残留信息
+                plugin_output = os.path.join(base_output, name)
+                os.makedirs(plugin_output, exist_ok=True)
+                plugin_meta.append((folder, name, plugin_output))
+
+            # 任务内不变的服务配置，先取出为局部变量
+            svc = cfg["name"]
+            model_id = cfg["model_id"]
+            base_url = cfg.get("base_url")
+            api_key = cfg.get("api_key")
+            temperature = float(cfg.get("temperature", 0.3))
+            top_p = float(cfg.get("top_p", 0.95))
+            err_policy = cfg.get("error_policy", {})
+            fallback_models = cfg.get("fallback_models") or []
+            # 每个备用模型对应的“其余备用模型”列表，切换时直接取用
+            fallback_plan = [(m, fallback_models[:i] + fallback_models[i + 1:]) for i, m in enumerate(fallback_models)]
+            only_tooltips = bool(cfg.get("only_tooltips"))
+
+            # 按服务的限流建议主动限速，所有插件共享同一个令牌桶；
+            # 没有限流规则或最小间隔为 0 的服务（如豆包、本地模型）起初不限速，
+            # 遇到第一次 429 后才开始按实测速率降速
+            rl_key = svc
+            if rl_key == "openrouter":
+                rl_key = "openrouter:google" if str(model_id or "").lower().startswith("google/") else "openrouter:general"
+            rl = TranslationConfig.RATE_LIMIT_RULES.get(rl_key)
+            bucket_interval = rl["min_interval_sec"] if rl else 0
+            bucket_burst = rl["suggested_concurrency"] if rl else 1
+            bucket = TokenBucket(1.0 / bucket_interval if bucket_interval else None, bucket_burst)
+
+            # 根据服务类型选择 Translator 的构造方式
+            def local_factory(mid, fallbacks):
+                # 本地服务 (Ollama/LMStudio) 使用专用翻译器，不支持备用模型列表
+                return self._get_translator_class(svc)(base_url=base_url, model_id=mid, temperature=temperature, top_p=top_p)
+
+            translator_factories = {
+                "ollama": local_factory,
+                "lmstudio": local_factory,
+                "siliconflow": lambda mid, fallbacks: self._get_translator_class("siliconflow")(api_key=api_key, model_id=mid, temperature=temperature, top_p=top_p),
+            }
+
+            def openai_factory(mid, fallbacks):
+                # 自定义服务及其他通用 OpenAI 兼容服务
+                # 自定义服务若未填 API Key,使用占位(本地 llamacpp 不校验 Key)
+                return Translator(api_key=api_key or "EMPTY", model_id=mid, base_url=base_url, temperature=temperature, top_p=top_p, fallback_models=fallbacks, service_name=svc)
+
+            translator_factory = translator_factories.get(svc, openai_factory)
+
+            def make_translator(mid, fallbacks):
+                translator = translator_factory(mid, fallbacks)
+                translator.only_tooltips = only_tooltips
+                translator.rate_limiter = bucket
+                return translator
+
+            # 先解析全部插件；节点数不足一批的小插件合并请求预翻译，
+            # 结果写入各自的 checkpoint，下面逐个翻译时从断点直接进入验证与补漏
+            parsed = {}
+            small_plugins = []
+            for meta in plugin_meta:
+                if not self.translating: break
+                folder, _, plugin_output = meta
                 try:
-                    self.cooldown_status.set("")
+                    nodes = self._get_parsed_nodes(folder)
                 except Exception:
-                    pass
+                    continue  # 解析失败留到逐个翻译时统一记录
+                parsed[folder] = nodes
+                ck = os.path.join(plugin_output, "_temp", "_checkpoint.json")
+                if nodes and len(nodes) < curr_batch_size and not os.path.exists(ck):
+                    small_plugins.append(meta)
+
+            if len(small_plugins) > 1 and self.translating:
+                pre_translator = make_translator(model_id, fallback_models)
+
+                def on_merged(meta, result):
+                    work_dir = os.path.join(meta[2], "_temp")
+                    os.makedirs(work_dir, exist_ok=True)
+                    pre_translator._save_checkpoint(os.path.join(work_dir, "_checkpoint.json"), result, 1)
+
+                self.log(f"[合并] {len(small_plugins)} 个小插件将合并请求翻译")
+                queue = BatchQueue(pre_translator, curr_batch_size, on_merged)
+                try:
+                    for meta in small_plugins:
+                        if not self.translating: break
+                        queue.enqueue(meta, parsed[meta[0]])
+                    queue.flush()
+                except Exception as e:
+                    # 合并请求失败不影响后续逐个翻译
+                    self.log(f"  > [合并] 合并请求失败，改为逐个翻译: {e}")
+
+            # 失败后是否切换备用模型："ask_once" 在本次任务第一次需要时询问，之后沿用该选择
+            fallback_allowed = {"always": True, "never": False}.get(
+                self.config.get("error_policy", _EMPTY).get("fallback_switch", "ask_once"))
+            fallback_lock = threading.Lock()
+            fallback_decided = threading.Event()
+            if fallback_allowed is not None:
+                fallback_decided.set()
+            fallback_asking = False
+
+            def task_stopped():
+                return not self.translating or self._closing
+
+            def may_use_fallback():
+                # 只由第一个需要的线程询问；询问期间不持有锁，其他线程等待结果时也会响应停止/关闭
+                nonlocal fallback_allowed, fallback_asking
+                with fallback_lock:
+                    should_ask = not fallback_decided.is_set() and not fallback_asking
+                    if should_ask:
+                        fallback_asking = True
+                if should_ask:
+                    answer = self._ask_on_main_thread(
+                        "确认切换",
+                        f"检测到限制或失败，本次任务中是否自动切换到备用模型：{'、'.join(fallback_models)}？",
+                        cancel=task_stopped)
+                    fallback_allowed = answer
+                    fallback_decided.set()
+                    return answer
+                while not fallback_decided.wait(self.ASK_WAIT_POLL_SEC):
+                    if task_stopped():
+                        return False
+                return fallback_allowed
+
+            # 各插件相互独立，使用线程池并发翻译；共享的结果列表由锁保护
+            state_lock = threading.Lock()
+
+            # 进度回调
+            def progress_cb(curr, total, msg=None):
+                # 兼容 (curr, msg) 与 (curr, total, msg) 两种形式，只关心消息文本
+                if isinstance(total, str):
+                    msg = total
+                if not msg:
+                    return
+                tag = next((t for t in _PROGRESS_LOG_TAGS if t in msg), None)
+                if tag is not None:
+                    self.log(f"  > {msg}")
+                    if tag in _PROGRESS_STATUS_TAGS:
+                        self._set_status_var(self.strategy_status, msg)
+
+            def translate_folder(i, folder, name, plugin_output):
+                if not self.translating: return
+
+                # 每个插件开始时清空冷却标签,避免上一插件的残留信息
+                self._set_status_var(self.cooldown_status, "")
                 self.log(f"[{i}/{total_folders}] 正在翻译插件: {name}")
+
+                # 解析或创建翻译器失败时，下面的失败处理仍会用到这些变量
+                translator = nodes = None
+
+                # 冷却状态回调(显示在 UI 的"深湖绿"标签上,仅在冷却中显示)
+                def cooldown_cb(batches_done, cooldown_sec_total, remaining_sec):
+                    # 仅在冷却中显示累计信息
+                    if cooldown_sec_total > 0:
+                        text = f"累计{batches_done}批,冷却翻译{cooldown_sec_total}秒 (剩余{remaining_sec}秒)"
+                    else:
+                        # 冷却结束,清空标签(非冷却期间不显示)
+                        text = ""
+                    self._set_status_var(self.cooldown_status, text)
                 
                 try:
-                    # 1. 解析
-                    parser = NodeParser(folder)
-                    nodes = parser.parse_folder(folder)
-                    nodes = parser.optimize_node_info(nodes)
+                    # 1. 解析 (预处理阶段已解析的直接复用)
+                    nodes = parsed.get(folder)
+                    if nodes is None:
+                        nodes = self._get_parsed_nodes(folder)
                     
                     if not nodes:
                         self.log(f"插件 {name} 无待翻译节点，跳过")
-                        continue
+                        return
                         
                     # 2. 翻译
-                    # 根据服务类型实例化 Translator
-                    # 自定义服务若未填 API Key,使用占位(本地 llamacpp 不校验 Key)
-                    effective_api_key = cfg["api_key"] or "EMPTY"
-                    if cfg["name"] == "ollama":
-                        translator = OllamaTranslator(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
-                    elif cfg["name"] == "lmstudio":
-                        translator = LMStudioTranslator(base_url=cfg["base_url"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
-                    elif cfg["name"] == "siliconflow":
-                        translator = SiliconFlowTranslator(api_key=cfg["api_key"], model_id=cfg["model_id"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95))
-                    else:
-                        # 自定义服务及其他通用 OpenAI 兼容服务
-                        translator = Translator(api_key=effective_api_key, model_id=cfg["model_id"], base_url=cfg["base_url"], temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95), fallback_models=cfg.get("fallback_models"), service_name=cfg["name"])
-                    setattr(translator, "only_tooltips", bool(cfg.get("only_tooltips")))
-
-                    # 冷却状态回调(显示在 UI 的"深湖绿"标签上,仅在冷却中显示)
-                    def cooldown_cb(batches_done, cooldown_sec_total, remaining_sec):
-                        # 仅在冷却中显示累计信息
-                        if cooldown_sec_total > 0:
-                            text = f"累计{batches_done}批,冷却翻译{cooldown_sec_total}秒 (剩余{remaining_sec}秒)"
-                        else:
-                            # 冷却结束,清空标签(非冷却期间不显示)
-                            text = ""
-                        try:
-                            self.root.after(0, lambda: self.cooldown_status.set(text))
-                        except Exception:
-                            pass
-
-                    # 进度回调
-                    def progress_cb(curr, total, msg=None):
-                        # 兼容不同类型的回调参数
-                        # 如果是 (curr, msg) 形式
-                        if isinstance(curr, int) and isinstance(total, str):
-                            msg = total
-                            progress = curr
-                        # 如果是 (curr, total, msg) 形式
-                        elif isinstance(curr, int) and isinstance(total, int):
-                            progress = int((curr / total) * 100)
-                        else:
-                            progress = 0
-
-                        if msg and ("[翻译]" in msg or "[验证]" in msg or "[完成]" in msg or "[统计]" in msg or "[限流]" in msg or "[策略]" in msg):
-                            self.log(f"  > {msg}")
-                        if msg and ("[限流]" in msg or "[策略]" in msg):
-                            self.strategy_status.set(msg)
+                    translator = make_translator(model_id, fallback_models)
 
                     translated = translator.translate_nodes(nodes, folder, batch_size=curr_batch_size, update_progress=progress_cb, temp_dir=None, rounds=rounds, cooldown_sec=cooldown_sec, batches_per_cooldown=batches_per_cooldown, update_cooldown=cooldown_cb)
                     
                     # 3. 后处理 (移除tooltip并保存)
-                    
-                    plugin_output = os.path.join(base_output, name)
-                    os.makedirs(plugin_output, exist_ok=True)
                     result_file = os.path.join(plugin_output, f"{name}.json")
                     FileUtils.save_json(translated, result_file)
                     
@@ -1963,25 +2577,21 @@ class ComfyUITranslator:
                     except Exception as e:
                         self.log(f"保存到ComfyUI目录失败: {e}")
                         
-                    successful.append(name)
+                    with state_lock:
+                        successful.append(name)
                     
                 except Exception as e:
                     err_text = str(e)
                     info = self._parse_error_info(err_text)
-                    # 自动切换备用模型
-                    fallback_models = cfg.get("fallback_models", [])
+                    # 自动切换备用模型（解析失败时没有可翻译的节点，不切换）
                     switched = False
-                    for m in fallback_models:
+                    use_fallback = nodes is not None and fallback_plan and may_use_fallback()
+                    for m, other_models in (fallback_plan if use_fallback else ()):
                         try:
-                            if not messagebox.askyesno("确认切换", f"检测到限制或失败，是否切换到备用模型：{m}？"):
-                                continue
                             self.log(f"[策略] 切换备用模型: {m}")
-                            self.strategy_status.set(f"[策略] 切换备用模型: {m}")
-                            translator = Translator(api_key=cfg.get("api_key"), model_id=m, base_url=cfg.get("base_url"), temperature=cfg.get("temperature", 0.3), top_p=cfg.get("top_p", 0.95), fallback_models=[x for x in fallback_models if x != m], service_name=cfg["name"])
-                            setattr(translator, "only_tooltips", bool(cfg.get("only_tooltips")))
+                            self._set_status_var(self.strategy_status, f"[策略] 切换备用模型: {m}")
+                            translator = make_translator(m, other_models)
                             translated = translator.translate_nodes(nodes, folder, batch_size=curr_batch_size, update_progress=progress_cb, temp_dir=None, rounds=rounds, cooldown_sec=cooldown_sec, batches_per_cooldown=batches_per_cooldown, update_cooldown=cooldown_cb)
-                            plugin_output = os.path.join(base_output, name)
-                            os.makedirs(plugin_output, exist_ok=True)
                             result_file = os.path.join(plugin_output, f"{name}.json")
                             FileUtils.save_json(translated, result_file)
                             try:
@@ -1989,60 +2599,88 @@ class ComfyUITranslator:
                                 self.log(f"已保存到: {comfy_file}")
                             except Exception as se:
                                 self.log(f"保存到ComfyUI目录失败: {se}")
-                            successful.append(name)
+                            with state_lock:
+                                successful.append(name)
                             switched = True
                             break
                         except Exception as se:
                             err_text = str(se)
                             continue
                     if switched:
-                        continue
+                        return
                     self.log(f"插件 {name} 翻译失败: {err_text}")
-                    failed.append(name)
+                    with state_lock:
+                        failed.append(name)
+                    failed_at = time.strftime('%Y-%m-%d %H:%M:%S')
                     localized = None
                     try:
-                        from src.translation_config import TranslationConfig
-                        localized = TranslationConfig.localize_error(info.get("code") or 0, info.get("provider") or "", info.get("raw") or err_text)
-                        if (localized.get("code") == 429):
-                            new_size = max(3, int(curr_batch_size) - 2)
-                            if new_size != curr_batch_size:
-                                self.log(f"  > [策略] 触发限流，自动将并发数从 {curr_batch_size} 降为 {new_size}")
-                                curr_batch_size = new_size
-                        if localized and localized.get("title"):
-                            self.log(f"  > [错误解析] 代码 {localized.get('code')}: {localized.get('title')}（{localized.get('reason')}）")
-                            sol = localized.get("solution")
+                        localized = _localize_error(info.get("code") or 0, info.get("provider") or "", info.get("raw") or err_text)
+                        code, title, reason, sol, params = _LOCALIZED_FIELDS(localized)
+                        if title:
+                            self.log(f"  > [错误解析] 代码 {code}: {title}（{reason}）")
                             if sol:
                                 self.log(f"  > [建议] {sol}")
-                            params = localized.get("params")
                             if isinstance(params, dict):
                                 for k, v in params.items():
                                     self.log(f"  > [参数说明] {k}: {v}")
                             # 指导建议（并发/间隔）
-                            key = cfg["name"]
+                            key = svc
                             if key == "openrouter":
                                 prov = (info.get("provider") or "").lower()
                                 if "google" in prov:
                                     key = "openrouter:google"
                                 else:
                                     key = "openrouter:general"
-                            rl = TranslationConfig.RATE_LIMIT_RULES.get(key)
-                            if rl:
-                                self.log(f"  > [限制建议] 推荐并发: {rl['suggested_concurrency']}，最小间隔: {rl['min_interval_sec']}秒（{rl['notes']}）")
-                                self.strategy_status.set(f"并发建议: {rl['suggested_concurrency']}，间隔≥{rl['min_interval_sec']}s")
-                            if (localized.get("code") == 429):
+                            rule = rl if key == rl_key else TranslationConfig.RATE_LIMIT_RULES.get(key)
+                            if rule:
+                                self.log(f"  > [限制建议] 推荐并发: {rule['suggested_concurrency']}，最小间隔: {rule['min_interval_sec']}秒（{rule['notes']}）")
+                                self._set_status_var(self.strategy_status, f"并发建议: {rule['suggested_concurrency']}，间隔≥{rule['min_interval_sec']}s")
+                            if code == 429:
                                 self.log("  > [预测] 该路由当前拥堵，通常在5-10分钟内恢复，请稍后重试或切换备用模型")
                     except Exception:
                         localized = None
-                    self.failed_records.append({
+                    record = {
                         "name": name,
                         "folder": folder,
                         "error": err_text,
-                        "time": time.strftime('%Y-%m-%d %H:%M:%S'),
+                        "time": failed_at,
                         "localized": localized,
                         "strategy_log": getattr(translator, "strategy_log", []),
-                        "policy": cfg.get("error_policy", {})
-                    })
-                    
+                        "policy": err_policy
+                    }
+                    with state_lock:
+                        self.failed_records.append(record)
+
+            def process_folder(i, folder, name, plugin_output):
+                # 单个插件的任何异常（包括失败处理本身出错）都只记为该插件失败，
+                # 不能经 future.result() 中断整个任务，跳过汇总、报告和临时目录清理
+                try:
+                    translate_folder(i, folder, name, plugin_output)
+                except Exception as e:
+                    self.log(f"插件 {name} 翻译失败: {e}")
+                    with state_lock:
+                        if name not in failed:
+                            failed.append(name)
+                        if not any(r.get("folder") == folder for r in self.failed_records):
+                            self.failed_records.append({
+                                "name": name,
+                                "folder": folder,
+                                "error": str(e),
+                                "time": time.strftime('%Y-%m-%d %H:%M:%S'),
+                                "localized": None,
+                                "strategy_log": [],
+                                "policy": err_policy
+                            })
+
+            # 插件级并发是 I/O 密集的 API 调用，并发数取服务限流规则建议的并发数
+            # （与令牌桶的突发量一致），与 CPU 核数和每批节点数无关；
+            # 没有限流规则的服务使用 ThreadPoolExecutor 的默认线程数
+            workers = max(1, min(rl["suggested_concurrency"], total_folders)) if rl else None
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as executor:
+                futures = [executor.submit(process_folder, i, *meta) for i, meta in enumerate(plugin_meta, 1)]
+                for future in as_completed(futures):
+                    future.result()
+
             if failed:
                 self.log(f"翻译任务结束。成功: {len(successful)}, 失败: {len(failed)}")
             else:
@@ -2063,44 +2701,28 @@ class ComfyUITranslator:
                     }
                     try:
                         # 汇总分析
-                        error_counts = {}
-                        retry_stats = {"rate_limit_retry": 0, "switch_single_user": 0, "split_batch": 0}
-                        for rec in self.failed_records:
-                            loc = rec.get("localized") or {}
-                            code = loc.get("code")
-                            if code is not None:
-                                error_counts[str(code)] = error_counts.get(str(code), 0) + 1
-                            for evt in rec.get("strategy_log", []):
-                                t = evt.get("type")
-                                if t in retry_stats:
-                                    retry_stats[t] += 1
+                        codes = [(rec.get("localized") or _EMPTY).get("code") for rec in self.failed_records]
+                        error_counts = Counter(str(code) for code in codes if code is not None)
+                        event_counts = Counter(evt.get("type") for rec in self.failed_records
+                                               for evt in rec.get("strategy_log", ()))
+                        retry_stats = {t: event_counts[t] for t in _STRATEGY_EVENT_TYPES}
                         report_content["analysis"] = {
-                            "error_counts": error_counts,
+                            "error_counts": dict(error_counts),
                             "strategy_stats": retry_stats
                         }
-                        # 建议配置
-                        from src.translation_config import TranslationConfig
-                        curr_service = self.config.get("current_service", "")
-                        key = curr_service
-                        if key == "openrouter":
+                        # 建议配置 (非 openrouter 时直接复用任务开始时查到的限流规则)
+                        report_rl = rl
+                        if svc == "openrouter":
                             # 粗略判断是否为Google路由
-                            prov = None
-                            for rec in self.failed_records:
-                                loc = rec.get("localized") or {}
-                                p = (loc.get("provider") or "").lower()
-                                if p:
-                                    prov = p
-                                    break
-                            if prov and "google" in prov:
-                                key = "openrouter:google"
-                            else:
-                                key = "openrouter:general"
-                        rl = TranslationConfig.RATE_LIMIT_RULES.get(key)
-                        if rl:
+                            prov = next((p for p in (((rec.get("localized") or _EMPTY).get("provider") or "").lower()
+                                                     for rec in self.failed_records) if p), None)
+                            key = "openrouter:google" if prov and "google" in prov else "openrouter:general"
+                            report_rl = TranslationConfig.RATE_LIMIT_RULES.get(key)
+                        if report_rl:
                             report_content["recommendations"] = {
-                                "suggested_concurrency": rl["suggested_concurrency"],
-                                "min_interval_sec": rl["min_interval_sec"],
-                                "notes": rl["notes"]
+                                "suggested_concurrency": report_rl["suggested_concurrency"],
+                                "min_interval_sec": report_rl["min_interval_sec"],
+                                "notes": report_rl["notes"]
                             }
                     except Exception:
                         pass
@@ -2111,14 +2733,12 @@ class ComfyUITranslator:
                         plugin_output = os.path.join(base_output, single_name)
                         os.makedirs(plugin_output, exist_ok=True)
                         report_file = os.path.join(plugin_output, f"report_{timestamp}.json")
-                        with open(report_file, 'w', encoding='utf-8') as f:
-                            json.dump(report_content, f, indent=4, ensure_ascii=False)
+                        FileUtils.save_json(report_content, report_file, indent=2)
                         self.log(f"翻译失败报告已生成: {report_file}")
                     else:
                         # 生成总失败报告
                         summary_file = os.path.join(base_output, f"report_{timestamp}.json")
-                        with open(summary_file, 'w', encoding='utf-8') as f:
-                            json.dump(report_content, f, indent=4, ensure_ascii=False)
+                        FileUtils.save_json(report_content, summary_file, indent=2)
                         self.log(f"翻译失败总报告已生成: {summary_file}")
 
                         # 为每个失败插件生成精简报告
@@ -2134,8 +2754,7 @@ class ComfyUITranslator:
                                 "failed_detail": rec
                             }
                             report_path = os.path.join(plugin_output, f"report_{timestamp}.json")
-                            with open(report_path, 'w', encoding='utf-8') as f:
-                                json.dump(plugin_report, f, indent=4, ensure_ascii=False)
+                            FileUtils.save_json(plugin_report, report_path, indent=2)
                 except Exception as e:
                     self.log(f"生成失败报告失败: {e}")
 
@@ -2143,20 +2762,14 @@ class ComfyUITranslator:
             if self.failed_records:
                 self.root.after(0, lambda: self.resume_hint.set(f"⚠ {len(self.failed_records)} 个插件失败,可点击「继续翻译」恢复"))
 
-            # 清理本次会话的检测临时目录
-            try:
-                import shutil
-                if hasattr(self, 'session_temp_dir') and os.path.isdir(self.session_temp_dir):
-                    shutil.rmtree(self.session_temp_dir, ignore_errors=True)
-            except Exception:
-                pass
+            # 清理本次会话的检测临时目录 (后台删除，小文件较多时不拖慢任务收尾和按钮恢复)
+            temp_dir = getattr(self, 'session_temp_dir', None)
+            if temp_dir and os.path.isdir(temp_dir):
+                threading.Thread(target=shutil.rmtree, args=(temp_dir,), kwargs={"ignore_errors": True}, daemon=True).start()
             if successful:
                 self.root.after(0, lambda: self.view_btn.config(state=tk.NORMAL))
             # 任务结束,清空冷却状态显示
-            try:
-                self.root.after(0, lambda: self.cooldown_status.set(""))
-            except Exception:
-                pass
+            self._set_status_var(self.cooldown_status, "")
 
         except Exception as e:
             self.log(f"任务出错: {e}")
@@ -2262,31 +2875,112 @@ class ComfyUITranslator:
         def task():
             try:
                 if cfg["name"] == "ollama":
-                    OllamaTranslator(cfg["base_url"], "").unload_model(cfg["model_id"])
+                    self._get_translator_class("ollama")(cfg["base_url"], "").unload_model(cfg["model_id"])
                 else:
-                    LMStudioTranslator(cfg["base_url"], "").unload_model(cfg["model_id"])
+                    self._get_translator_class("lmstudio")(cfg["base_url"], "").unload_model(cfg["model_id"])
                 self.log("卸载完成")
             except Exception as e:
                 self.log(f"卸载失败: {e}")
         threading.Thread(target=task, daemon=True).start()
 
+    def _mark_config_dirty(self):
+        """标记配置已修改，500ms 内的多次修改合并为一次写盘"""
+        self._config_dirty = True
+        if not self._config_flush_scheduled:
+            self._config_flush_scheduled = True
+            self.root.after(self.CONFIG_FLUSH_DELAY_MS, self._flush_config)
+
+    def _flush_config(self):
+        """把配置交给后台线程写入 config.json"""
+        self._config_flush_scheduled = False
+        if not self._config_dirty:
+            return
+        self._config_dirty = False
+        # UI 线程只做深拷贝得到一致的快照，序列化与写盘都在后台线程中进行
+        snapshot = copy.deepcopy(self.config)
+        self._config_writer.submit(self._write_config_snapshot, CONFIG_PATH, snapshot)
+
+    def _write_config_snapshot(self, path: str, cfg: dict):
+        """在后台线程中序列化配置快照并写盘"""
+        try:
+            data = FileUtils.dumps_json(cfg, indent=4)
+        except Exception as e:
+            logging.error(f"保存配置失败: {e}")
+            return
+        self._dump_config_atomic(path, data)
+
+    @staticmethod
+    def _dump_config_atomic(path: str, data: bytes):
+        """把序列化好的配置一次性写入临时文件，再原子替换目标文件，
+        避免中途失败留下残缺的配置"""
+        tmp_path = path + '.tmp'
+        try:
+            # 二进制大缓冲写入，跳过文本层逐块编码
+            with open(tmp_path, 'wb', buffering=CONFIG_IO_BUFFER_SIZE) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.error(f"保存配置失败: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _on_close(self):
+        """关闭窗口前写出尚未保存的配置"""
+        self._closing = True
+        try:
+            self._flush_config()
+            self._config_writer.shutdown(wait=True)
+        finally:
+            self.root.destroy()
+
+    def _ensure_config_schema(self):
+        """补齐配置中各服务相关的字典段，之后的保存逻辑可直接写入而无需逐次判断"""
+        for key in ("api_keys", "model_ids", "api_configs", "model_history", "backup_models", "translation_params"):
+            self.config.setdefault(key, {})
+
     def _load_config(self) -> dict:
         try:
-            if not os.path.exists('config.json'):
+            if not os.path.exists(CONFIG_PATH):
                 return {}
-            with open('config.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    return {}
-                return data
+            with open(CONFIG_PATH, 'rb', buffering=CONFIG_IO_BUFFER_SIZE) as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            if not isinstance(data, dict):
+                return {}
+            return data
         except:
             return {}
 
     def setup_console_ui(self): # 简单占位，保持结构完整
-        text = scrolledtext.ScrolledText(self.console_tab, bg="#87baab", fg="#000000")
-        text.pack(fill=tk.BOTH, expand=True)
+        toolbar = ttk.Frame(self.console_tab)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(toolbar, text="显示级别:").pack(side=tk.LEFT, padx=(5, 0))
+        level_var = tk.StringVar(value="信息")
+        level_combo = ttk.Combobox(toolbar, textvariable=level_var, values=list(_CONSOLE_LEVELS),
+                                   state="readonly", width=8)
+        level_combo.pack(side=tk.LEFT, padx=5, pady=2)
+        coalesce_var = tk.BooleanVar(value=True)
+        coalesce_check = ttk.Checkbutton(toolbar, text="合并重复消息", variable=coalesce_var)
+        coalesce_check.pack(side=tk.LEFT, padx=5)
+        
+        view = ttk.Treeview(self.console_tab, show="tree", selectmode="extended", style="Console.Treeview")
+        vbar = ttk.Scrollbar(self.console_tab, orient=tk.VERTICAL, command=view.yview)
+        view.configure(yscrollcommand=vbar.set)
+        vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         # 将日志重定向到这里
-        logging.getLogger().addHandler(TextHandler(text))
+        handler = TextHandler(view, vbar)
+        logging.getLogger().addHandler(handler)
+        
+        def on_level_change(event=None):
+            handler.min_display_level = _CONSOLE_LEVELS.get(level_var.get(), logging.INFO)
+        level_combo.bind("<<ComboboxSelected>>", on_level_change)
+        
+        def on_coalesce_change():
+            handler.coalesce_enabled = coalesce_var.get()
+        coalesce_check.configure(command=on_coalesce_change)
         
     def setup_help_ui(self):
         text = scrolledtext.ScrolledText(self.help_tab, bg="#87baab", fg="#000000", font=("微软雅黑", 10))
@@ -2344,6 +3038,8 @@ class ComfyUITranslator:
         text.configure(state='disabled')
 
 if __name__ == "__main__":
+    # 检测阶段使用进程池，打包为 exe 后子进程需要该调用才能正常启动
+    multiprocessing.freeze_support()
     print("Starting application...")
     # 配置日志
     logging.basicConfig(
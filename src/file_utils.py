@@ -3,6 +3,14 @@ import json
 from typing import List, Dict
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+# JSON 写盘缓冲区大小：整份内容先编码为 bytes，再一次写出
+JSON_WRITE_BUFFER_SIZE = 1 << 20
+
 class FileUtils:
     """文件工具类
     
@@ -70,20 +78,47 @@ class FileUtils:
         return found_files
 
     @staticmethod
-    def save_json(data: dict, file_path: str):
+    def dumps_json(data, indent: int = 4) -> bytes:
+        """将数据编码为 UTF-8 JSON bytes
+        
+        orjson 只支持 2 空格缩进，因此仅在 indent 为 2 时使用 orjson，
+        其他缩进使用标准库 json，是否安装 orjson 输出格式都一致
+        
+        Args:
+            data: 要编码的数据
+            indent: 缩进空格数
+        """
+        if orjson is not None and indent == 2:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def save_json(data: dict, file_path: str, indent: int = 4):
         """保存 JSON 文件
         
         Args:
             data: 要保存的数据
             file_path: 文件路径
+            indent: 缩进空格数
         """
         try:
             # 确保目标目录存在
             os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
             
-            # 保存文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            # 先整体编码再一次写出，避免 json.dump 逐段小块写入
+            payload = FileUtils.dumps_json(data, indent)
+            # 写入临时文件后原子替换，中途出错不会留下截断的 JSON
+            tmp_path = file_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+                    f.write(payload)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
                 
         except Exception as e:
             raise Exception(f"保存 JSON 文件失败: {str(e)}")
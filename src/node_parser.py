@@ -2,15 +2,50 @@ import ast
 import os
 import logging
 import json
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional
 from src.file_utils import FileUtils
 
+# 部件类型（其余类型如 IMAGE、LATENT、MODEL 等视为连线输入）
+_WIDGET_TYPES = frozenset({
+    'INT', 'FLOAT', 'STRING', 'BOOLEAN',
+    'COMBO', 'DROPDOWN', 'TEXT', 'TEXTAREA',
+    'SLIDER', 'CHECKBOX', 'COLOR', 'RADIO',
+    'SELECT', 'NUMBER'
+})
+
+# 需要替换为参数名本身的类型值（包括ComfyUI常见类型）
+_TYPE_REPLACEMENTS = frozenset({
+    'INT', 'FLOAT', 'BOOL', 'STRING', 'NUMBER', 'BOOLEAN',
+    'IMAGE', 'MASK', 'MODEL', 'LATENT', 'VAE', 'CLIP',
+    'CONDITIONING', 'CONTROL_NET', 'COMBO'
+})
+
+def _constant_attr_handler(key: str):
+    """生成类属性处理函数：属性值为常量时写入 node_info[key]"""
+    def handler(parser, node_info: Dict, value: ast.AST):
+        if isinstance(value, ast.Constant):
+            node_info[key] = value.value
+    return handler
+
+def _parse_file_worker(file_path: str, global_node_mappings: Optional[Dict], global_display_names: Optional[Dict]) -> Dict:
+    """在子进程中解析单个 Python 文件
+
+    定义在模块顶层，供 parse_folder 的进程池调用
+    """
+    return NodeParser(os.path.dirname(file_path)).parse_file(file_path, global_node_mappings, global_display_names)
+
 class NodeParser:
     """ComfyUI 节点解析器类
     
     用于解析 Python 文件中的 ComfyUI 节点定义,提取需要翻译的文本信息
     """
 
+    # Python 文件数达到该值时用进程池并行解析（进程启动有固定开销，文件少时顺序解析更快）
+    PARALLEL_PARSE_MIN_FILES = 8
+
     def __init__(self, folder_path: str):
         """初始化节点解析器
         
@@ -20,6 +55,9 @@ class NodeParser:
         self.folder_path = folder_path
         self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.dirs = FileUtils.init_output_dirs(self.base_path)
+        # 源码与 AST 缓存：路径 -> [st_mtime_ns, st_size, 源码, AST]
+        # 同一插件的文件会被 __init__.py 映射扫描、逐文件解析和 V3 检测多次读取
+        self._ast_cache: Dict[str, list] = {}
 
     def parse_file(self, file_path: str, global_node_mappings: Optional[Dict] = None, global_display_names: Optional[Dict] = None) -> Dict:
         """解析单个 Python 文件
@@ -35,20 +73,21 @@ class NodeParser:
         """
         logging.info(f"开始解析文件: {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # 解析 Python 代码为 AST
-        tree = ast.parse(content)
+        tree = self._read_and_parse(file_path)
         nodes_info = {}
 
         # 首先获取映射信息
         node_mappings = {}  # 类名到节点名的映射
         display_names = {}  # 节点名到显示名的映射
+        class_nodes = []  # 类定义，等映射收集完成后再解析
 
-        # 获取 NODE_CLASS_MAPPINGS 和 NODE_DISPLAY_NAME_MAPPINGS
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
+        # 单次遍历模块级语句：同时获取 NODE_CLASS_MAPPINGS、NODE_DISPLAY_NAME_MAPPINGS 和类定义
+        # 节点类和映射都定义在模块级，无需递归进入函数体和表达式
+        for node in self._iter_stmts(tree.body):
+            if isinstance(node, ast.ClassDef):
+                class_nodes.append(node)
+            elif isinstance(node, ast.Assign):
                 targets = [t.id for t in node.targets if isinstance(t, ast.Name)]
                 if 'NODE_CLASS_MAPPINGS' in targets and isinstance(node.value, ast.Dict):
                     # 修改这里的映射获取逻辑
@@ -80,69 +119,175 @@ class NodeParser:
         if global_display_names:
             display_names.update(global_display_names)
 
+        # 映射中的类在模块级找不到时（定义在工厂函数或其他类内部），
+        # 回退到 ast.walk 遍历整个文件，补上嵌套定义的类
+        found = {node.name for node in class_nodes}
+        if any(class_name not in found for class_name in node_mappings):
+            module_level = set(map(id, class_nodes))
+            class_nodes.extend(node for node in ast.walk(tree)
+                               if isinstance(node, ast.ClassDef) and id(node) not in module_level)
+
         # 解析节点类
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                logging.debug(f"检查类: {node.name}")
-                if self._is_comfy_node(node):
-                    node_info = self._parse_node_class(node)
-                    if node_info:
-                        # 获取节点名称的多种可能来源
-                        class_name = node.name
-                        
-                        # 1. 首先尝试从NODE_CLASS_MAPPINGS获取映射名称
-                        mapped_name = node_mappings.get(class_name)
-                        
-                        # 2. 如果没有映射，检查类是否有NODE_NAME属性
-                        node_name = getattr(node, 'NODE_NAME', None) if not mapped_name else None
-                        
-                        # 3. 最后使用类名
-                        node_key = mapped_name or node_name or class_name
-                        
-                        # 获取显示名称的多种可能来源
-                        display_name = (
-                            display_names.get(node_key) or  # 1. 从NODE_DISPLAY_NAME_MAPPINGS
-                            getattr(node, 'NODE_DISPLAY_NAME', None) or  # 2. 类属性
-                            node_key  # 3. 默认使用节点键
-                        )
-                        # 对 CamelCase 标题进行分词处理
-                        display_name = self._split_camel_case(display_name)
-                        
-                        logging.info(f"解析节点名称: 类名={class_name}, 映射名={mapped_name}, 最终键={node_key}, 显示名={display_name}")
-                        
-                        # 确保节点信息包含所有必要字段
-                        full_node_info = {
-                            "_class_name": class_name,  # 保留原始类名
-                            "_mapped_name": mapped_name,  # 保留映射名
-                            "title": display_name,
-                            "inputs": node_info.get("inputs", {}),
-                            "widgets": node_info.get("widgets", {}),
-                            "outputs": node_info.get("outputs", {}),
-                            "tooltips": node_info.get("tooltips", {}),
-                            "_source_file": file_path  # 记录源文件路径
-                        }
-                        
-                        nodes_info[node_key] = full_node_info
-                        
-                        logging.info(f"成功解析完整节点信息: {node_key}")
+        for node in class_nodes:
+            logging.debug(f"检查类: {node.name}")
+            node_info = self._parse_node_class(node)
+            if node_info:
+                # 获取节点名称的多种可能来源
+                class_name = node.name
+                
+                # 优先使用NODE_CLASS_MAPPINGS中的映射名称（即 ComfyUI 注册的键），否则使用类名
+                mapped_name = node_mappings.get(class_name)
+                node_key = mapped_name or class_name
+                
+                # 获取显示名称的多种可能来源
+                display_name = (
+                    display_names.get(node_key) or  # 1. 从NODE_DISPLAY_NAME_MAPPINGS
+                    node_info.get('display_name') or  # 2. 类属性 NODE_DISPLAY_NAME
+                    node_key  # 3. 默认使用节点键
+                )
+                # 对 CamelCase 标题进行分词处理
+                display_name = self._split_camel_case(display_name)
+                
+                logging.info(f"解析节点名称: 类名={class_name}, 映射名={mapped_name}, 最终键={node_key}, 显示名={display_name}")
+                
+                # 确保节点信息包含所有必要字段
+                full_node_info = {
+                    "_class_name": class_name,  # 保留原始类名
+                    "_mapped_name": mapped_name,  # 保留映射名
+                    "title": display_name,
+                    "inputs": node_info.get("inputs", {}),
+                    "widgets": node_info.get("widgets", {}),
+                    "outputs": node_info.get("outputs", {}),
+                    "tooltips": node_info.get("tooltips", {}),
+                    "_source_file": file_path  # 记录源文件路径
+                }
+                
+                nodes_info[node_key] = full_node_info
+                
+                logging.info(f"成功解析完整节点信息: {node_key}")
         
         logging.info(f"文件 {file_path} 解析完成，找到 {len(nodes_info)} 个节点")
         return nodes_info
 
+    def _read_source(self, file_path: str) -> str:
+        """读取源码，文件未修改（mtime 和大小相同）时直接返回缓存
+
+        Args:
+            file_path: Python 文件路径
+
+        Returns:
+            str: 文件内容
+        """
+        st = os.stat(file_path)
+        entry = self._ast_cache.get(file_path)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            entry = [st.st_mtime_ns, st.st_size, content, None]
+            self._ast_cache[file_path] = entry
+        return entry[2]
+
+    def _read_and_parse(self, file_path: str) -> ast.Module:
+        """读取并解析文件为 AST，文件未修改时复用缓存的 AST
+
+        Args:
+            file_path: Python 文件路径
+
+        Returns:
+            ast.Module: 模块的 AST
+        """
+        content = self._read_source(file_path)
+        entry = self._ast_cache[file_path]
+        if entry[3] is None:
+            entry[3] = self._compile_ast(content, file_path)
+        return entry[3]
+
+    @staticmethod
+    def _compile_ast(content: str, file_path: str) -> ast.Module:
+        """将源码编译为 AST
+
+        直接调用 compile 并跳过 __future__ 标志继承；不使用 PyCF_OPTIMIZED_AST，
+        因为常量折叠会把 ("IMAGE",) 这类元组变成 Constant，导致类型元组无法识别
+
+        Args:
+            content: Python 源码
+            file_path: 文件路径（用于语法错误信息）
+
+        Returns:
+            ast.Module: 模块的 AST
+        """
+        return compile(content, file_path, 'exec', ast.PyCF_ONLY_AST, dont_inherit=True)
+
+    @staticmethod
+    def _iter_stmts(stmts: List[ast.stmt]):
+        """遍历语句列表，包括 if/try/with/for 等代码块中嵌套的语句
+
+        不进入函数和类的定义体，避免像 ast.walk 那样递归访问所有表达式节点
+
+        Args:
+            stmts: 语句列表（模块的 tree.body 或方法的 body）
+
+        Yields:
+            ast.stmt: 同一作用域内的语句
+        """
+        for stmt in stmts:
+            yield stmt
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            for field in ('body', 'handlers', 'orelse', 'finalbody'):
+                block = getattr(stmt, field, None)
+                if block:
+                    yield from NodeParser._iter_stmts(block)
+
+    def _attr_return_types(self, node_info: Dict, value: ast.AST):
+        """RETURN_TYPES：为每个返回类型创建默认输出名称"""
+        for i, return_type in enumerate(self._parse_return_types(value)):
+            node_info['outputs'][f'output_{i}'] = return_type
+
+    def _attr_return_names(self, node_info: Dict, value: ast.AST):
+        """RETURN_NAMES：使用自定义名称替换默认输出名称（名称同时作为键和值）"""
+        return_names = self._parse_return_names(value)
+        if return_names:
+            node_info['outputs'] = {name: name for name in return_names}
+
+    def _attr_node_name(self, node_info: Dict, value: ast.AST):
+        """NODE_NAME：作为节点标题，重复定义时以第一次为准"""
+        if node_info['title'] is None and isinstance(value, ast.Constant) and isinstance(value.value, str):
+            node_info['title'] = value.value
+
+    def _attr_display_name(self, node_info: Dict, value: ast.AST):
+        """NODE_DISPLAY_NAME：作为显示名称的备选来源"""
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            node_info['display_name'] = value.value
+
+    # 类属性名 -> 处理函数，_parse_node_class 遍历类体时按属性名查表分发
+    _CLASS_ATTR_HANDLERS = {
+        'RETURN_TYPES': _attr_return_types,
+        'RETURN_NAMES': _attr_return_names,
+        'NODE_NAME': _attr_node_name,
+        'NODE_DISPLAY_NAME': _attr_display_name,
+        'CATEGORY': _constant_attr_handler('category'),
+        'FUNCTION': _constant_attr_handler('function'),
+        'OUTPUT_NODE': _constant_attr_handler('is_output'),
+    }
+
     def _parse_node_class(self, class_node: ast.ClassDef) -> Optional[Dict]:
         """解析节点类定义
         
+        单次遍历类体，同时判断是否为 ComfyUI 节点、提取节点信息以及 NODE_NAME/NODE_DISPLAY_NAME 类属性
+        
         Args:
             class_node: 类定义的 AST 节点
             
         Returns:
             Optional[Dict]: 节点信息字典,如果不是 ComfyUI 节点则返回 None
         """
-        if not self._is_comfy_node(class_node):
-            return None
-            
+        has_input_types = False
+        has_define_schema = False  # V3 API
+        seen_attrs = set()  # 出现过的类属性名
+        
         node_info = {
-            'title': self._get_node_title(class_node),
+            'title': None,
             'inputs': {},
             'outputs': {},
             'widgets': {},
@@ -153,7 +298,8 @@ class NodeParser:
         for item in class_node.body:
             # 检查 INPUT_TYPES 方法
             if isinstance(item, ast.FunctionDef) and item.name == 'INPUT_TYPES':
-                # 检查是否是类方法
+                # 无论是否为类方法都视为节点，但只解析类方法
+                has_input_types = True
                 if any(isinstance(decorator, ast.Name) and decorator.id == 'classmethod' 
                       for decorator in item.decorator_list):
                     parsed_types = self._parse_input_types_method(item)
@@ -172,6 +318,7 @@ class NodeParser:
             elif isinstance(item, ast.FunctionDef) and item.name == 'define_schema':
                 if any(isinstance(decorator, ast.Name) and decorator.id == 'classmethod'
                       for decorator in item.decorator_list):
+                    has_define_schema = True
                     schema_info = self._parse_define_schema_inputs(item)
                     if schema_info:
                         if 'inputs' in schema_info:
@@ -183,101 +330,28 @@ class NodeParser:
                         if 'tooltips' in schema_info:
                             node_info['tooltips'].update(schema_info['tooltips'])
             
-            # 解析类属性
-            elif isinstance(item, ast.Assign):
-                targets = [t.id for t in item.targets if isinstance(t, ast.Name)]
-                
-                # 解析 RETURN_TYPES
-                if 'RETURN_TYPES' in targets:
-                    return_types = self._parse_return_types(item.value)
-                    if return_types:
-                        # 为每个返回类型创建默认输出名称
-                        for i, return_type in enumerate(return_types):
-                            node_info['outputs'][f'output_{i}'] = return_type
-                
-                # 解析 RETURN_NAMES
-                # 注意：这里不使用elif，确保RETURN_NAMES总是被处理
-                if 'RETURN_NAMES' in targets:
-                    return_names = self._parse_return_names(item.value)
-                    if return_names:
-                        # 使用自定义名称替换默认输出名称
-                        outputs = {}
-                        # 确保有足够的输出名称
-                        for i, name in enumerate(return_names):
-                            # 使用名称作为键和值
-                            outputs[name] = name
-                        node_info['outputs'] = outputs
-                        
-                # 解析其他属性
-                elif 'CATEGORY' in targets:
-                    if isinstance(item.value, ast.Constant):
-                        node_info['category'] = item.value.value
-                elif 'FUNCTION' in targets:
-                    if isinstance(item.value, ast.Constant):
-                        node_info['function'] = item.value.value
-                elif 'OUTPUT_NODE' in targets:
-                    if isinstance(item.value, ast.Constant):
-                        node_info['is_output'] = item.value.value
-        
-        return node_info
-
-    def _is_comfy_node(self, class_node: ast.ClassDef) -> bool:
-        """检查类是否是 ComfyUI 节点
-        
-        Args:
-            class_node: 类定义的 AST 节点
-            
-        Returns:
-            bool: 是否是 ComfyUI 节点
-        """
-        has_input_types = False
-        has_return_types = False
-        has_category = False
-        has_function = False
-        has_define_schema = False  # V3 API
-        
-        # 首先检查类方法
-        for item in class_node.body:
-            # 检查 INPUT_TYPES 方法
-            if isinstance(item, ast.FunctionDef) and item.name == 'INPUT_TYPES':
-                # 检查是否是类方法或普通方法
-                if (any(isinstance(decorator, ast.Name) and decorator.id == 'classmethod' 
-                      for decorator in item.decorator_list) or
-                    item.name == 'INPUT_TYPES'):
-                    has_input_types = True
-            
-            # 检查 define_schema 方法 (V3 API)
-            if isinstance(item, ast.FunctionDef) and item.name == 'define_schema':
-                if any(isinstance(decorator, ast.Name) and decorator.id == 'classmethod'
-                      for decorator in item.decorator_list):
-                    has_define_schema = True
-                
-            # 检查类属性
+            # 解析类属性，按属性名分发给对应的处理函数
             elif isinstance(item, ast.Assign):
                 for target in item.targets:
                     if isinstance(target, ast.Name):
-                        if target.id == 'RETURN_TYPES':
-                            has_return_types = True
-                        elif target.id == 'CATEGORY':
-                            has_category = True
-                        elif target.id == 'FUNCTION':
-                            has_function = True
-        
-        # 记录详细信息
-        logging.debug(f"节点类 {class_node.name} 检查结果:")
-        logging.debug(f"- INPUT_TYPES: {has_input_types}")
-        logging.debug(f"- RETURN_TYPES: {has_return_types}")
-        logging.debug(f"- CATEGORY: {has_category}")
-        logging.debug(f"- FUNCTION: {has_function}")
-        logging.debug(f"- define_schema (V3): {has_define_schema}")
+                        handler = self._CLASS_ATTR_HANDLERS.get(target.id)
+                        if handler is not None:
+                            seen_attrs.add(target.id)
+                            handler(self, node_info, item.value)
+        
+        has_return_types = 'RETURN_TYPES' in seen_attrs
+        logging.debug(f"节点类 {class_node.name} 检查结果: INPUT_TYPES={has_input_types}, "
+                      f"RETURN_TYPES={has_return_types}, define_schema (V3)={has_define_schema}")
         
         # 支持传统API (INPUT_TYPES/RETURN_TYPES) 和 V3 API (define_schema)
-        is_node = has_input_types or has_return_types or has_define_schema
+        if not (has_input_types or has_return_types or has_define_schema):
+            return None
         
-        if is_node:
-            logging.info(f"找到 ComfyUI 节点类: {class_node.name} {'(V3)' if has_define_schema and not has_input_types else ''}")
+        logging.info(f"找到 ComfyUI 节点类: {class_node.name} {'(V3)' if has_define_schema and not has_input_types else ''}")
         
-        return is_node
+        # 如果没有 NODE_NAME 属性,使用类名（进行CamelCase分词）
+        node_info['title'] = node_info['title'] or self._split_camel_case(class_node.name)
+        return node_info
 
     def _parse_input_types_method(self, method_node: ast.FunctionDef) -> Dict:
         """解析 INPUT_TYPES 方法，同时提取输入和部件信息
@@ -294,8 +368,8 @@ class NodeParser:
             'tooltips': {}
         }
         
-        # 查找 return 语句
-        for node in ast.walk(method_node):
+        # 查找 return 语句（包括 if/else 分支中的 return，不进入嵌套函数）
+        for node in self._iter_stmts(method_node.body):
             if isinstance(node, ast.Return) and isinstance(node.value, ast.Dict):
                 # 解析返回的字典
                 for key, value in zip(node.value.keys, node.value.values):
@@ -368,22 +442,7 @@ class NodeParser:
         Returns:
             bool: 是否是部件类型
         """
-        widget_types = {
-            'INT', 'FLOAT', 'STRING', 'BOOLEAN', 
-            'COMBO', 'DROPDOWN', 'TEXT', 'TEXTAREA',
-            'SLIDER', 'CHECKBOX', 'COLOR', 'RADIO',
-            'SELECT', 'NUMBER'
-        }
-        
-        # 添加一些常见的输入类型
-        input_types = {
-            'IMAGE', 'LATENT', 'MODEL', 'VAE', 'CLIP', 
-            'CONDITIONING', 'MASK', 'STYLE_MODEL',
-            'CONTROL_NET', 'BBOX', 'SEGS'
-        }
-        
-        return (type_name.upper() in widget_types and 
-                type_name.upper() not in input_types)
+        return type_name.upper() in _WIDGET_TYPES
 
     def _parse_return_types(self, value_node: ast.AST) -> List[str]:
         """解析 RETURN_TYPES 定义
@@ -459,99 +518,22 @@ class NodeParser:
         
         return name
     
-    def _get_node_title(self, class_node: ast.ClassDef) -> str:
-        """获取节点的显示标题
-        
-        Args:
-            class_node: 类定义的 AST 节点
-            
-        Returns:
-            str: 节点标题
-        """
-        # 首先查找 NODE_NAME 属性
-        for item in class_node.body:
-            if isinstance(item, ast.Assign):
-                targets = [t.id for t in item.targets if isinstance(t, ast.Name)]
-                if 'NODE_NAME' in targets and isinstance(item.value, ast.Str):
-                    return item.value.s
-                    
-        # 如果没有 NODE_NAME 属性,使用类名（进行CamelCase分词）
-        return self._split_camel_case(class_node.name)
+    @staticmethod
+    def _replace_type_values(fields: Dict) -> Dict:
+        """将值为类型名（如 INT、IMAGE）的项替换为参数名本身
 
-    def _parse_widgets(self, node_class) -> Dict:
-        """解析节点的部件信息
-        
-        Args:
-            node_class: 节点类
-            
-        Returns:
-            Dict: 部件信息字典
-        """
-        widgets = {}
-        
-        # 检查类是否有 REQUIRED 属性
-        if hasattr(node_class, 'REQUIRED'):
-            required = node_class.REQUIRED
-            # 遍历所有必需的部件
-            for widget_name, widget_type in required.items():
-                # 使用原始的部件名称作为值，而不是类型
-                widgets[widget_name] = widget_name
-                
-        # 检查类是否有 OPTIONAL 属性
-        if hasattr(node_class, 'OPTIONAL'):
-            optional = node_class.OPTIONAL
-            # 遍历所有可选的部件
-            for widget_name, widget_type in optional.items():
-                # 使用原始的部件名称作为值，而不是类型
-                widgets[widget_name] = widget_name
-                
-        return widgets
+        大多数节点的值已经是参数名，无需替换时直接复用原字典，不再逐项复制
 
-    def _parse_inputs(self, node_class) -> Dict:
-        """解析节点的输入信息
-        
         Args:
-            node_class: 节点类
-            
-        Returns:
-            Dict: 输入信息字典
-        """
-        inputs = {}
-        
-        # 检查类是否有 INPUT_TYPES 属性
-        if hasattr(node_class, 'INPUT_TYPES'):
-            input_types = node_class.INPUT_TYPES
-            # 如果 INPUT_TYPES 是一个字典
-            if isinstance(input_types, dict) and 'required' in input_types:
-                required = input_types['required']
-                # 遍历所有必需的输入
-                for input_name, input_type in required.items():
-                    # 使用原始的输入名称作为值
-                    inputs[input_name] = input_name
-                    
-        return inputs
+            fields: inputs/widgets/outputs 字典
 
-    def _parse_outputs(self, node_class) -> Dict:
-        """解析节点的输出信息
-        
-        Args:
-            node_class: 节点类
-            
         Returns:
-            Dict: 输出信息字典
+            Dict: 替换后的字典
         """
-        outputs = {}
-        
-        # 检查类是否有 RETURN_TYPES 属性
-        if hasattr(node_class, 'RETURN_TYPES'):
-            return_types = node_class.RETURN_TYPES
-            # 遍历所有输出类型
-            for i, output_type in enumerate(return_types):
-                output_name = f"output_{i}"
-                # 使用原始的输出名称作为值
-                outputs[output_name] = output_name
-                
-        return outputs
+        if not any(value in _TYPE_REPLACEMENTS for value in fields.values()):
+            return fields
+        return {name: name if value in _TYPE_REPLACEMENTS else value
+                for name, value in fields.items()}
 
     def optimize_node_info(self, nodes_info: Dict) -> Dict:
         """优化节点信息，处理特殊的键值情况并规范化格式
@@ -564,28 +546,6 @@ class NodeParser:
         """
         optimized = {}
         
-        # 定义需要替换的类型（包括ComfyUI常见类型）
-        type_replacements = {
-            'INT': True,
-            'FLOAT': True,
-            'BOOL': True,
-            'STRING': True,
-            'NUMBER': True,
-            'BOOLEAN': True,
-            'IMAGE': True,
-            'MASK': True,
-            'MODEL': True,
-            'LATENT': True,
-            'VAE': True,
-            'CLIP': True,
-            'CONDITIONING': True,
-            'CONTROL_NET': True,
-            'COMBO': True
-        }
-        
-        # 定义字段顺序
-        field_order = ['title', 'inputs', 'widgets', 'outputs', 'tooltips']
-        
         for node_name, node_info in nodes_info.items():
             # 创建一个有序字典来保持字段顺序
             optimized_node = {}
@@ -594,41 +554,30 @@ class NodeParser:
             if '_api_version' in node_info:
                 optimized_node['_api_version'] = node_info['_api_version']
             
-            # 按照指定顺序添加字段
-            for field in field_order:
-                if field == 'title':
-                    optimized_node['title'] = node_info.get('title', '')
-                elif field == 'inputs':
-                    optimized_node['inputs'] = {}
-                    for input_name, input_value in node_info.get('inputs', {}).items():
-                        if input_value in type_replacements:
-                            optimized_node['inputs'][input_name] = input_name
-                        else:
-                            optimized_node['inputs'][input_name] = input_value
-                elif field == 'widgets':
-                    optimized_node['widgets'] = {}
-                    for widget_name, widget_value in node_info.get('widgets', {}).items():
-                        if widget_value in type_replacements:
-                            optimized_node['widgets'][widget_name] = widget_name
-                        else:
-                            optimized_node['widgets'][widget_name] = widget_value
-                elif field == 'outputs':
-                    optimized_node['outputs'] = {}
-                    for output_name, output_value in node_info.get('outputs', {}).items():
-                        if output_value in type_replacements:
-                            optimized_node['outputs'][output_name] = output_name
-                        else:
-                            optimized_node['outputs'][output_name] = output_value
-                elif field == 'tooltips':
-                    if 'tooltips' in node_info:
-                        optimized_node['tooltips'] = node_info['tooltips']
+            # 按照 title, inputs, widgets, outputs, tooltips 的顺序添加字段
+            optimized_node['title'] = node_info.get('title', '')
+            optimized_node['inputs'] = self._replace_type_values(node_info.get('inputs', {}))
+            optimized_node['widgets'] = self._replace_type_values(node_info.get('widgets', {}))
+            optimized_node['outputs'] = self._replace_type_values(node_info.get('outputs', {}))
+            if 'tooltips' in node_info:
+                optimized_node['tooltips'] = node_info['tooltips']
             
             optimized[node_name] = optimized_node
         
         return optimized
 
-    def parse_folder(self, folder_path: str) -> Dict:
-        """解析文件夹中的所有相关文件（递归扫描）"""
+    def parse_folder(self, folder_path: str, parallel: bool = False) -> Dict:
+        """解析文件夹中的所有相关文件（递归扫描）
+
+        Args:
+            folder_path: 插件文件夹路径
+            parallel: 是否用进程池并行解析 Python 文件。只应由检测阶段开启（同一时间只有一个检测任务）；
+                翻译阶段的线程池和检测阶段的进程池 worker 中调用时保持顺序解析，
+                避免多个进程池同时启动，以及 fork 出的子进程继承界面日志处理器及其锁
+
+        Returns:
+            Dict: 优化后的节点信息字典
+        """
         all_nodes = {}
         
         # 获取插件专属的输出目录（仅主目录）
@@ -668,10 +617,8 @@ class NodeParser:
         init_file = os.path.join(folder_path, '__init__.py')
         if os.path.isfile(init_file):
             try:
-                with open(init_file, 'r', encoding='utf-8') as f:
-                    init_content = f.read()
-                init_tree = ast.parse(init_content)
-                for init_node in ast.walk(init_tree):
+                init_tree = self._read_and_parse(init_file)
+                for init_node in self._iter_stmts(init_tree.body):
                     if isinstance(init_node, ast.Assign):
                         targets = [t.id for t in init_node.targets if isinstance(t, ast.Name)]
                         if 'NODE_CLASS_MAPPINGS' in targets and isinstance(init_node.value, ast.Dict):
@@ -690,50 +637,68 @@ class NodeParser:
             except Exception as e:
                 logging.warning(f"解析 __init__.py 全局映射失败: {e}")
 
+        def mappings_for(file_path):
+            # 对于 __init__.py 自身不传全局映射（避免循环）
+            if os.path.basename(file_path) == '__init__.py':
+                return None, None
+            return global_node_mappings, global_display_names
+
+        # 第二步：按目录归档文件，只记录文件名和类型，不读取文件 - 满足用户需求 3, 7
+        dir_files = defaultdict(list)
+        py_file_infos = []  # (文件路径, file_info)，仅 Python 文件需要解析提取节点
         for file_path in all_files:
+            file_ext = os.path.splitext(file_path)[1].lower()
+            file_info = {
+                "name": os.path.basename(file_path),
+                "full_path": file_path, # 满足用户需求 4, 7
+                "type": file_ext[1:] if file_ext else "unknown",
+                "nodes": []
+            }
+            dir_files[os.path.dirname(file_path)].append(file_info)
+            if file_ext == '.py':
+                py_file_infos.append((file_path, file_info))
+
+        for dir_path, files in dir_files.items():
+            # 计算相对路径作为目录key
+            rel_path = os.path.relpath(dir_path, folder_path)
+            if rel_path == '.': rel_path = ''
+            structure_data["directories"][rel_path] = {
+                "path": os.path.join(folder_path, rel_path) if rel_path else folder_path,
+                "files": files
+            }
+
+        # 第三步：ast.parse 是持有 GIL 的 CPU 密集任务，调用方允许且 Python 文件较多时提交到进程池并行解析；
+        # 在子进程中调用时无论 parallel 如何都不再嵌套进程池
+        futures = {}
+        executor = None
+        if (parallel and len(py_file_infos) >= self.PARALLEL_PARSE_MIN_FILES
+                and multiprocessing.parent_process() is None):
             try:
-                # 计算相对路径作为目录key - 满足用户需求 7
-                rel_path = os.path.relpath(os.path.dirname(file_path), folder_path)
-                if rel_path == '.': rel_path = ''
-                
-                # 初始化目录结构条目
-                if rel_path not in structure_data["directories"]:
-                    structure_data["directories"][rel_path] = {
-                        "path": os.path.join(folder_path, rel_path) if rel_path else folder_path,
-                        "files": []
-                    }
-                
-                file_ext = os.path.splitext(file_path)[1].lower()
-                file_info = {
-                    "name": os.path.basename(file_path),
-                    "full_path": file_path, # 满足用户需求 4, 7
-                    "type": file_ext[1:] if file_ext else "unknown",
-                    "nodes": []
-                }
-                
-                # 仅处理 Python 文件提取节点
-                if file_ext == '.py':
-                    logging.info(f"正在解析文件: {file_path}")
+                executor = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(py_file_infos)))
+                for file_path, _ in py_file_infos:
+                    futures[file_path] = executor.submit(_parse_file_worker, file_path, *mappings_for(file_path))
+            except Exception as e:
+                logging.warning(f"启动并行解析失败，改为顺序解析: {e}")
+                futures = {}
 
-                    # 解析文件（传入 __init__.py 中的全局映射）
-                    # 对于 __init__.py 自身不传全局映射（避免循环）
-                    is_init = os.path.basename(file_path) == '__init__.py'
-                    nodes = self.parse_file(
-                        file_path,
-                        global_node_mappings=None if is_init else global_node_mappings,
-                        global_display_names=None if is_init else global_display_names
-                    )
-                    
-                    if nodes:
-                        debug_info["found_nodes"] += len(nodes)
-                        all_nodes.update(nodes)
-                        file_info["nodes"] = list(nodes.keys())
-                        logging.info(f"从文件 {file_path} 中解析出 {len(nodes)} 个节点: {list(nodes.keys())}")
-                    else:
-                        logging.info(f"文件 {file_path} 中未找到节点")
+        for file_path, file_info in py_file_infos:
+            try:
+                logging.info(f"正在解析文件: {file_path}")
+
+                # 解析文件（传入 __init__.py 中的全局映射），按文件顺序取回并行解析的结果
+                future = futures.get(file_path)
+                if future is not None:
+                    nodes = future.result()
+                else:
+                    nodes = self.parse_file(file_path, *mappings_for(file_path))
                 
-                # 记录文件信息到结构数据
-                structure_data["directories"][rel_path]["files"].append(file_info)
+                if nodes:
+                    debug_info["found_nodes"] += len(nodes)
+                    all_nodes.update(nodes)
+                    file_info["nodes"] = list(nodes.keys())
+                    logging.info(f"从文件 {file_path} 中解析出 {len(nodes)} 个节点: {list(nodes.keys())}")
+                else:
+                    logging.info(f"文件 {file_path} 中未找到节点")
                 
                 # 兼容旧的 debug_info
                 debug_info["file_details"].append({
@@ -751,6 +716,9 @@ class NodeParser:
                     "error": str(e)
                 })
                 continue
+
+        if executor is not None:
+            executor.shutdown()
         
         # 保存结构化信息到临时文件，避免污染结果目录
         try:
@@ -817,10 +785,7 @@ class NodeParser:
         # 2. 遍历每个入口文件，解析扩展类和节点列表
         for extension_file in entrypoint_files:
             try:
-                with open(extension_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
+                tree = self._read_and_parse(extension_file)
                 
                 # 查找ComfyExtension类
                 node_classes = []
@@ -862,8 +827,7 @@ class NodeParser:
             py_files = FileUtils.scan_python_files(folder_path)
             for file_path in py_files:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = self._read_source(file_path)
                     
                     # 检查是否定义了comfy_entrypoint函数
                     if 'async def comfy_entrypoint' in content or 'def comfy_entrypoint' in content:
@@ -889,8 +853,7 @@ class NodeParser:
         init_file = os.path.join(folder_path, '__init__.py')
         if os.path.exists(init_file):
             try:
-                with open(init_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(init_file)
                 
                 # 检查是否导入了comfy_entrypoint
                 if 'comfy_entrypoint' in content:
@@ -899,7 +862,7 @@ class NodeParser:
                         return {'file': init_file, 'type': 'definition'}
 
                     # 尝试找到导入的源文件
-                    tree = ast.parse(content)
+                    tree = self._read_and_parse(init_file)
                     for node in ast.walk(tree):
                         if isinstance(node, (ast.ImportFrom, ast.Import)):
                             if isinstance(node, ast.ImportFrom):
@@ -924,8 +887,7 @@ class NodeParser:
             py_files = FileUtils.scan_python_files(folder_path)
             for file_path in py_files:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = self._read_source(file_path)
                     
                     # 检查是否定义了comfy_entrypoint函数
                     if 'async def comfy_entrypoint' in content or 'def comfy_entrypoint' in content:
@@ -951,7 +913,7 @@ class NodeParser:
         for item in class_node.body:
             if isinstance(item, ast.AsyncFunctionDef) and item.name == 'get_node_list':
                 # 查找return语句
-                for stmt in ast.walk(item):
+                for stmt in self._iter_stmts(item.body):
                     if isinstance(stmt, ast.Return) and stmt.value:
                         if isinstance(stmt.value, ast.List):
                             # 提取列表中的类名
@@ -977,10 +939,7 @@ class NodeParser:
         
         # 尝试从extension_file中找到导入语句
         try:
-            with open(extension_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            tree = self._read_and_parse(extension_file)
             
             # 查找节点类的导入
             for node in ast.walk(tree):
@@ -1008,8 +967,7 @@ class NodeParser:
             py_files = FileUtils.scan_python_files(folder_path)
             for file_path in py_files:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = self._read_source(file_path)
                     
                     if f'class {node_class_name}' in content:
                         return self._parse_v3_node_file(file_path, node_class_name)
@@ -1031,10 +989,7 @@ class NodeParser:
             Dict: 节点信息字典
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            tree = self._read_and_parse(file_path)
             
             # 查找节点类
             for node in ast.walk(tree):
@@ -1065,7 +1020,7 @@ class NodeParser:
         }
         
         # 查找return语句中的io.Schema调用
-        for stmt in ast.walk(method_node):
+        for stmt in self._iter_stmts(method_node.body):
             if isinstance(stmt, ast.Return) and stmt.value:
                 if isinstance(stmt.value, ast.Call):
                     schema_call = stmt.value
@@ -1116,7 +1071,7 @@ class NodeParser:
         }
         
         # 查找return语句中的io.Schema调用
-        for stmt in ast.walk(method_node):
+        for stmt in self._iter_stmts(method_node.body):
             if isinstance(stmt, ast.Return) and stmt.value:
                 if isinstance(stmt.value, ast.Call):
                     # 检查是否是io.Schema调用
@@ -144,10 +144,14 @@ class OllamaTranslator(Translator):
         except Exception as e:
             raise Exception(f"翻译失败: {str(e)}")
 
-    def get_available_models(self) -> List[str]:
-        """获取可用的Ollama模型列表"""
+    def get_available_models(self, timeout=10) -> List[str]:
+        """获取可用的Ollama模型列表
+
+        Args:
+            timeout: 请求超时，可为秒数或 (连接超时, 读取超时)
+        """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = requests.get(f"{self.base_url}/api/tags", timeout=timeout)
             
             if response.status_code != 200:
                 raise Exception(f"获取模型列表失败，状态码: {response.status_code}")
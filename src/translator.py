@@ -17,6 +17,9 @@ class Translator:
     负责调用火山引擎 API 将节点信息翻译成中文
     """
     
+    # 可选的限流器(由调用方设置)，需提供 acquire()/on_success()/on_rate_limited()
+    rate_limiter = None
+    
     def __init__(self, api_key: str, model_id: str, base_url: str = "https://ark.cn-beijing.volces.com/api/v3", temperature: float = 0.3, top_p: float = 0.95, fallback_models: Optional[List[str]] = None, service_name: Optional[str] = None):
         """初始化翻译器
         
@@ -453,7 +456,7 @@ class Translator:
                         if update_progress:
                             update_progress(95, f"[限流补偿] 批次 {deferred_done}/{(deferred_total + deferred_batch_size - 1) // deferred_batch_size}: {', '.join(list(d_batch.keys())[:3])}...")
                         try:
-                            res = self._translate_batch(d_batch, update_progress, 95)
+                            res = self._limited_translate_batch(d_batch, update_progress, 95)
                             self._merge_translations(all_translated_nodes, res)
                             # 保存checkpoint以支持断点续传
                             self._save_checkpoint(checkpoint_file, all_translated_nodes, total_batches)
@@ -504,7 +507,7 @@ class Translator:
                         break
                     tmp_missing_file = os.path.join(work_dir, f"round_{r}_missing.tmp.json")
                     FileUtils.save_json(missing_batch, tmp_missing_file)
-                    translated_missing = self._translate_batch(missing_batch, update_progress, 96)
+                    translated_missing = self._limited_translate_batch(missing_batch, update_progress, 96)
                     before_cov = self._coverage(final_corrected)
                     self._merge_translations(final_corrected, translated_missing)
                     after_cov = self._coverage(final_corrected)
@@ -604,9 +607,25 @@ class Translator:
         except Exception:
             pass  # checkpoint 保存失败不应中断翻译
 
+    def _limited_translate_batch(self, batch: Dict, update_progress=None, progress: int = 0) -> Dict:
+        """经限流器发出的 _translate_batch，并把成功/限流结果反馈给限流器"""
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self._translate_batch(batch, update_progress, progress)
+        limiter.acquire()
+        try:
+            result = self._translate_batch(batch, update_progress, progress)
+        except Exception as e:
+            err_str = str(e).lower()
+            if "429" in err_str or "rate limit" in err_str or "rate-limited" in err_str:
+                limiter.on_rate_limited()
+            raise
+        limiter.on_success()
+        return result
+
     def _translate_with_fallback(self, full_batch_data: Dict, update_progress=None, progress: int = 0, _depth: int = 0) -> Dict:
         try:
-            return self._translate_batch(full_batch_data, update_progress, progress)
+            return self._limited_translate_batch(full_batch_data, update_progress, progress)
         except Exception as e:
             items = list(full_batch_data.items())
             if _depth >= 2 or len(items) <= 1: